@@ -1,11 +1,38 @@
-from .job_input import preprocess_job_description
+import importlib
+
+# These submodules do no I/O on import, so they are bound eagerly. Their
+# modules share the names of the functions exported here, and importing a
+# submodule rebinds the package attribute to it, so they cannot be lazy.
 from .search_linkedin import search_linkedin
-from .score_candidates import score_candidates
+from .score_candidates import score_candidates, score_candidates_batch, score_candidates_multi
 from .generate_outreach import generate_outreach
+from .job_profile import JobProfile
+
+# job_input pulls in Selenium and BeautifulSoup, so it is imported on first
+# attribute access (PEP 562)
+_LAZY_EXPORTS = {
+    'preprocess_job_description': '.job_input',
+}
 
 __all__ = [
     'preprocess_job_description',
     'search_linkedin',
     'score_candidates',
-    'generate_outreach'
-]
\ No newline at end of file
+    'score_candidates_batch',
+    'score_candidates_multi',
+    'generate_outreach',
+    'JobProfile',
+]
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,154 @@
+import atexit
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+# selenium and webdriver_manager are imported on first use: they are slow to
+# import and most processes (e.g. the API) never start a browser
+
+# Constants
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", "50"))  # Recycle a browser after this many pages
+PAGE_LOAD_TIMEOUT = 15
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def chromedriver_path() -> str:
+    """Resolve the chromedriver binary once per process."""
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+def _page_ready(min_text_length: int):
+    """
+    Wait condition: the document has loaded and rendered at least
+    min_text_length characters of visible text. A loaded SPA shell already
+    shows some text ("Loading..."), so a bare non-empty check returns too early.
+    """
+    def ready(driver) -> bool:
+        return driver.execute_script(
+            "return document.readyState === 'complete' && "
+            "!!document.body && document.body.innerText.trim().length >= arguments[0]",
+            max(min_text_length, 1)
+        )
+    return ready
+
+
+class _PooledDriver:
+    __slots__ = ("driver", "pages")
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+
+class BrowserPool:
+    """
+    Pool of long-lived headless Chrome instances.
+
+    At most `size` browsers exist at once. Idle browsers are health-checked
+    before reuse, and each is recycled after `max_pages` pages to bound its
+    memory growth.
+    """
+
+    def __init__(self, size: int = BROWSER_POOL_SIZE, max_pages: int = BROWSER_MAX_PAGES):
+        self.size = size
+        self.max_pages = max_pages
+        self._idle = queue.LifoQueue()  # Most recently used first, so warm browsers stay warm
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _new_driver(self) -> _PooledDriver:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")  # Run in background
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        driver = webdriver.Chrome(service=Service(chromedriver_path()), options=chrome_options)
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT * 2)
+        return _PooledDriver(driver)
+
+    @staticmethod
+    def _healthy(entry: _PooledDriver) -> bool:
+        from selenium.common.exceptions import WebDriverException
+        try:
+            return entry.driver.execute_script("return 1") == 1
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def _quit(entry: _PooledDriver):
+        from selenium.common.exceptions import WebDriverException
+        try:
+            entry.driver.quit()
+        except WebDriverException:
+            pass
+
+    def _checkout(self) -> _PooledDriver:
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                return self._new_driver()
+            if self._healthy(entry):
+                return entry
+            self._quit(entry)
+
+    @contextmanager
+    def driver(self):
+        """Borrow a browser; blocks while all `size` browsers are in use."""
+        self._slots.acquire()
+        entry = None
+        try:
+            entry = self._checkout()
+            yield entry.driver
+            entry.pages += 1
+            if entry.pages < self.max_pages:
+                self._idle.put(entry)
+                entry = None
+        finally:
+            # Recycled, or the page failed and the session may be broken
+            if entry is not None:
+                self._quit(entry)
+            self._slots.release()
+
+    def fetch(self, url: str, timeout: float = PAGE_LOAD_TIMEOUT, min_text_length: int = 1) -> str:
+        """
+        Load a page and return its rendered HTML once it shows at least
+        min_text_length characters of text, or whatever it shows after timeout.
+        """
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        with self.driver() as driver:
+            driver.get(url)
+            try:
+                WebDriverWait(driver, timeout).until(_page_ready(min_text_length))
+            except TimeoutException:
+                pass  # Use whatever has rendered so far
+            return driver.page_source
+
+    def close(self):
+        """Quit all idle browsers."""
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+def get_browser_pool() -> BrowserPool:
+    """Process-wide browser pool, created on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.close)
+        return _pool
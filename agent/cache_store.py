@@ -0,0 +1,570 @@
+import json
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .records import CandidateRecord
+
+# SQLite limits the number of bound parameters per statement
+MAX_BATCH = 500
+
+# Bumped when the schema gains something existing databases must be backfilled with
+# (2: profile_index rows carry their linkedin_url)
+SCHEMA_VERSION = 2
+
+# Profile fields in the full-text index, with their BM25 weights
+INDEXED_FIELDS = ("name", "headline", "current_company", "location")
+INDEX_WEIGHTS = (1.0, 3.0, 2.0, 1.0)
+MAX_QUERY_TERMS = 32
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in is of on or our the to we with you your will who".split()
+)
+INDEX_SCHEMA = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS profile_index USING fts5(
+        linkedin_url UNINDEXED, {', '.join(INDEXED_FIELDS)}, tokenize = 'porter unicode61'
+    )
+"""
+
+
+class CacheStore:
+    """
+    SQLite-backed profile cache keyed by linkedin_url.
+
+    The database runs in WAL mode so several uvicorn workers can read while one
+    writes, and each thread gets its own connection. Entries older than
+    expiry_seconds are filtered out by the queries and removed by purge_expired().
+
+    A second table caches search queries (by fingerprint) to the list of result
+    URLs, with its own query_expiry_seconds. A third stores generated outreach
+    messages; their TTL and size bound are given by the caller. A fourth keeps
+    parsed job pages by job_id with their HTTP validators (ETag/Last-Modified).
+    Scoring keeps job-independent candidate features in features, and queued
+    sourcing runs with their results live in sourcing_runs.
+
+    Profiles are also kept in an FTS5 full-text index (profile_index) that is
+    updated with every write, so cached candidates can be searched locally with
+    search_profiles(). Index rows carry their linkedin_url, which search joins
+    on. When SQLite lacks FTS5, full_text_search is False and local search finds nothing.
+    """
+
+    def __init__(self, path: str, expiry_seconds: float, query_expiry_seconds: Optional[float] = None):
+        self.path = path
+        self.expiry_seconds = expiry_seconds
+        self.query_expiry_seconds = expiry_seconds if query_expiry_seconds is None else query_expiry_seconds
+        self._local = threading.local()
+        self._create_schema()
+        self.full_text_search = self._create_index()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode; writes open explicit transactions
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self):
+        self._connect().executescript("""
+            CREATE TABLE IF NOT EXISTS profiles (
+                linkedin_url TEXT PRIMARY KEY,
+                profile TEXT NOT NULL,
+                timestamp REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_profiles_timestamp ON profiles(timestamp);
+            CREATE TABLE IF NOT EXISTS queries (
+                fingerprint TEXT PRIMARY KEY,
+                urls TEXT NOT NULL,
+                timestamp REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_queries_timestamp ON queries(timestamp);
+            CREATE TABLE IF NOT EXISTS messages (
+                cache_key TEXT PRIMARY KEY,
+                linkedin_url TEXT NOT NULL,
+                job_fingerprint TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                message TEXT NOT NULL,
+                timestamp REAL NOT NULL,
+                accessed REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_messages_accessed ON messages(accessed);
+            CREATE TABLE IF NOT EXISTS job_pages (
+                job_id TEXT PRIMARY KEY,
+                job TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                rendered INTEGER NOT NULL,
+                timestamp REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS features (
+                linkedin_url TEXT PRIMARY KEY,
+                profile_hash TEXT NOT NULL,
+                rubric_version TEXT NOT NULL,
+                features TEXT NOT NULL,
+                timestamp REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_features_timestamp ON features(timestamp);
+            CREATE TABLE IF NOT EXISTS sourcing_runs (
+                run_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                request TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                owner TEXT NOT NULL,
+                created REAL NOT NULL,
+                started REAL,
+                finished REAL,
+                heartbeat REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_sourcing_runs_status ON sourcing_runs(status);
+        """)
+        columns = {row[1] for row in self._connect().execute("PRAGMA table_info(sourcing_runs)")}
+        if "heartbeat" not in columns:
+            self._connect().execute("ALTER TABLE sourcing_runs ADD COLUMN heartbeat REAL")
+
+    def _create_index(self) -> bool:
+        """Create (or upgrade) the full-text index. False when this SQLite build has no FTS5."""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                    # Databases created before the index (or before its linkedin_url column) get it rebuilt once
+                    conn.execute("DROP TABLE IF EXISTS profile_index")
+                    conn.execute(INDEX_SCHEMA)
+                    self._reindex(conn)
+                else:
+                    conn.execute(INDEX_SCHEMA)
+        except sqlite3.OperationalError as e:
+            print(f"Full-text index unavailable, local profile search is disabled: {str(e)}")
+            return False
+        return True
+
+    def rebuild_index(self) -> int:
+        """
+        Re-index every stored profile. Worth running after a VACUUM, which may
+        renumber the profiles rowids that index updates use. Returns the number indexed.
+        """
+        if not self.full_text_search:
+            return 0
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            return self._reindex(conn)
+
+    def _reindex(self, conn: sqlite3.Connection) -> int:
+        conn.execute("DELETE FROM profile_index")
+        rows = conn.execute("SELECT rowid, linkedin_url, profile FROM profiles").fetchall()
+        conn.executemany(
+            f"INSERT INTO profile_index (rowid, linkedin_url, {', '.join(INDEXED_FIELDS)}) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (rowid, url, *self._index_fields(profile))
+                for (rowid, url, _), profile in zip(rows, CandidateRecord.decode_many(profile for _, _, profile in rows))
+            ]
+        )
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        return len(rows)
+
+    @staticmethod
+    def _index_fields(profile: Dict) -> tuple:
+        return tuple(str(profile.get(field) or "") for field in INDEXED_FIELDS)
+
+    def _valid_window(self, expiry_seconds: Optional[float] = None) -> tuple:
+        """Timestamp bounds of unexpired entries (future timestamps are invalid)."""
+        now = time.time()
+        return now - (self.expiry_seconds if expiry_seconds is None else expiry_seconds), now
+
+    def get_profile(self, linkedin_url: str) -> Optional[CandidateRecord]:
+        """Return the cached profile for a URL, or None if missing or expired."""
+        return self.get_profiles([linkedin_url]).get(linkedin_url)
+
+    def get_profiles(self, linkedin_urls: Iterable[str]) -> Dict[str, CandidateRecord]:
+        """Return unexpired cached profiles for the given URLs, keyed by URL."""
+        return {url: profile for url, (profile, _) in self.get_entries(linkedin_urls).items()}
+
+    def get_entries(self, linkedin_urls: Iterable[str]) -> Dict[str, Tuple[CandidateRecord, float]]:
+        """Like get_profiles, but each value is a (profile, timestamp) pair."""
+        urls = list(dict.fromkeys(url for url in linkedin_urls if url))
+        oldest, now = self._valid_window()
+        conn = self._connect()
+        found = {}
+        for i in range(0, len(urls), MAX_BATCH):
+            chunk = urls[i:i + MAX_BATCH]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT linkedin_url, profile, timestamp FROM profiles "
+                f"WHERE linkedin_url IN ({placeholders}) AND timestamp >= ? AND timestamp <= ?",
+                (*chunk, oldest, now)
+            ).fetchall()
+            profiles = CandidateRecord.decode_many(profile for _, profile, _ in rows)
+            for (url, _, timestamp), profile in zip(rows, profiles):
+                found[url] = (profile, timestamp)
+        return found
+
+    def iter_profiles(self, batch_size: int = MAX_BATCH) -> Iterator[CandidateRecord]:
+        """Yield every stored profile, expired or not, reading batch_size rows at a time."""
+        cursor = self._connect().execute("SELECT profile FROM profiles")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from CandidateRecord.decode_many(profile for (profile,) in rows)
+
+    def upsert_profiles(self, profiles: Iterable[Dict], timestamp: Optional[float] = None) -> int:
+        """
+        Insert or refresh profiles (dicts or CandidateRecords) in one transaction.
+        Returns the number written.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        rows = [
+            (profile["linkedin_url"], CandidateRecord.from_dict(profile), timestamp)
+            for profile in profiles if profile.get("linkedin_url")
+        ]
+        return self._write_profiles(rows)
+
+    def _write_profiles(self, rows: List[Tuple[str, CandidateRecord, float]]) -> int:
+        if not rows:
+            return 0
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO profiles (linkedin_url, profile, timestamp) VALUES (?, ?, ?) "
+                "ON CONFLICT(linkedin_url) DO UPDATE SET profile = excluded.profile, timestamp = excluded.timestamp",
+                [(url, record.encode(), timestamp) for url, record, timestamp in rows]
+            )
+            if self.full_text_search:
+                self._index_profiles(conn, {url: self._index_fields(record) for url, record, _ in rows})
+        return len(rows)
+
+    @staticmethod
+    def _index_profiles(conn: sqlite3.Connection, fields: Dict[str, tuple]):
+        """
+        Replace the index rows of the given profiles. Index rows reuse the profiles
+        rowid so they can be replaced without scanning the index; search matches
+        them to profiles by linkedin_url.
+        """
+        urls = list(fields)
+        for i in range(0, len(urls), MAX_BATCH):
+            chunk = urls[i:i + MAX_BATCH]
+            rowids = conn.execute(
+                f"SELECT rowid, linkedin_url FROM profiles WHERE linkedin_url IN ({','.join('?' * len(chunk))})",
+                chunk
+            ).fetchall()
+            conn.executemany("DELETE FROM profile_index WHERE rowid = ?", [(rowid,) for rowid, _ in rowids])
+            conn.executemany(
+                f"INSERT INTO profile_index (rowid, linkedin_url, {', '.join(INDEXED_FIELDS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                [(rowid, url, *fields[url]) for rowid, url in rowids]
+            )
+
+    @staticmethod
+    def _query_terms(query: str) -> List[str]:
+        """Distinct non-stopword words of a query, each quoted so no word acts as an FTS5 operator."""
+        terms = [term for term in dict.fromkeys(re.findall(r"\w+", query.lower())) if term not in STOPWORDS]
+        return [f'"{term}"' for term in terms[:MAX_QUERY_TERMS]]
+
+    @staticmethod
+    def _search_expressions(conn: sqlite3.Connection, terms: List[str]) -> Iterable[str]:
+        """FTS5 expressions from narrowest to broadest, generated lazily since each pass may be the last."""
+        yield " AND ".join(terms)
+        if len(terms) == 1:
+            return
+        indexed = [
+            term for term in terms
+            if conn.execute("SELECT 1 FROM profile_index WHERE profile_index MATCH ? LIMIT 1", (term,)).fetchone()
+        ]
+        if 1 < len(indexed) < len(terms):
+            yield " AND ".join(indexed)
+        yield " OR ".join(indexed or terms)
+
+    def search_profiles(self, query: str, limit: int = 10) -> List[CandidateRecord]:
+        """
+        Full-text search over cached, unexpired profiles (name, headline, company
+        and location), best BM25 match first.
+
+        Profiles matching every query word come first, then those matching every
+        word that occurs in the index at all; only when there are still fewer than
+        limit is the search widened to profiles matching any word. The narrow
+        passes are cheap, while ranking a broad match costs time proportional to
+        the number of matching profiles.
+        """
+        terms = self._query_terms(query)
+        if not terms or limit <= 0 or not self.full_text_search:
+            return []
+
+        oldest, now = self._valid_window()
+        conn = self._connect()
+        found = {}
+        for expression in self._search_expressions(conn, terms):
+            rows = conn.execute(
+                f"SELECT p.linkedin_url, p.profile FROM profile_index "
+                f"JOIN profiles p ON p.linkedin_url = profile_index.linkedin_url "
+                f"WHERE profile_index MATCH ? AND p.timestamp >= ? AND p.timestamp <= ? "
+                f"ORDER BY bm25(profile_index, {', '.join(map(str, INDEX_WEIGHTS))}) LIMIT ?",
+                (expression, oldest, now, limit)
+            )
+            for url, profile in rows:
+                if url not in found and len(found) < limit:
+                    found[url] = CandidateRecord.decode(profile)
+            if len(found) >= limit:
+                break
+        return list(found.values())
+
+    def get_query(self, fingerprint: str) -> Optional[List[str]]:
+        """Return the cached result URLs for a query fingerprint, or None if missing or expired."""
+        oldest, now = self._valid_window(self.query_expiry_seconds)
+        row = self._connect().execute(
+            "SELECT urls FROM queries WHERE fingerprint = ? AND timestamp >= ? AND timestamp <= ?",
+            (fingerprint, oldest, now)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_query(self, fingerprint: str, urls: List[str]):
+        """Store the result URLs of a query, replacing any previous entry."""
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO queries (fingerprint, urls, timestamp) VALUES (?, ?, ?)",
+                (fingerprint, json.dumps(urls), time.time())
+            )
+
+    def get_features(self, linkedin_urls: Iterable[str], rubric_version: str) -> Dict[str, Tuple[str, str]]:
+        """
+        Return {linkedin_url: (profile_hash, features)} for the URLs with features
+        stored under rubric_version. Callers compare the hash with the current profile.
+        """
+        urls = list(dict.fromkeys(linkedin_urls))
+        conn = self._connect()
+        found = {}
+        for i in range(0, len(urls), MAX_BATCH):
+            chunk = urls[i:i + MAX_BATCH]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT linkedin_url, profile_hash, features FROM features "
+                f"WHERE rubric_version = ? AND linkedin_url IN ({placeholders})",
+                (rubric_version, *chunk)
+            )
+            for url, profile_hash, features in rows:
+                found[url] = (profile_hash, features)
+        return found
+
+    def put_features(self, rows: Iterable[Tuple[str, str, str, str]]) -> int:
+        """Store (linkedin_url, profile_hash, rubric_version, features) rows, replacing older ones."""
+        now = time.time()
+        rows = [(*row, now) for row in rows]
+        if not rows:
+            return 0
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT OR REPLACE INTO features (linkedin_url, profile_hash, rubric_version, features, timestamp) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def create_run(self, run_id: str, request: Dict, owner: str):
+        """Record a queued sourcing run for the given request, owned by a worker process."""
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO sourcing_runs (run_id, status, request, owner, created, heartbeat) "
+                "VALUES (?, 'queued', ?, ?, ?, ?)",
+                (run_id, json.dumps(request), owner, now, now)
+            )
+
+    def start_run(self, run_id: str):
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "UPDATE sourcing_runs SET status = 'running', started = ?, heartbeat = ? WHERE run_id = ?",
+                (now, now, run_id)
+            )
+
+    def heartbeat_runs(self, owner: str) -> int:
+        """Mark the unfinished runs of owner as still alive. Returns the number updated."""
+        conn = self._connect()
+        with conn:
+            return conn.execute(
+                "UPDATE sourcing_runs SET heartbeat = ? WHERE owner = ? AND status IN ('queued', 'running')",
+                (time.time(), owner)
+            ).rowcount
+
+    def finish_run(self, run_id: str, status: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        """Store the outcome of a run: status is "succeeded" (with a result) or "failed" (with an error)."""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "UPDATE sourcing_runs SET status = ?, result = ?, error = ?, finished = ? WHERE run_id = ?",
+                (status, None if result is None else json.dumps(result), error, time.time(), run_id)
+            )
+
+    def get_run(self, run_id: str) -> Optional[Dict]:
+        """A sourcing run as a dict (run_id, status, request, result, error and timestamps), or None."""
+        row = self._connect().execute(
+            "SELECT run_id, status, request, result, error, created, started, finished FROM sourcing_runs "
+            "WHERE run_id = ?",
+            (run_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        run_id, status, request, result, error, created, started, finished = row
+        return {
+            "run_id": run_id,
+            "status": status,
+            "request": json.loads(request),
+            "result": None if result is None else json.loads(result),
+            "error": error,
+            "created": created,
+            "started": started,
+            "finished": finished,
+        }
+
+    def fail_stale_runs(self, before: float, error: str) -> int:
+        """Fail queued or running runs without a heartbeat since before. Returns the number failed."""
+        conn = self._connect()
+        with conn:
+            return conn.execute(
+                "UPDATE sourcing_runs SET status = 'failed', error = ?, finished = ? "
+                "WHERE status IN ('queued', 'running') AND COALESCE(heartbeat, created) < ?",
+                (error, time.time(), before)
+            ).rowcount
+
+    def get_message(self, cache_key: str, expiry_seconds: float) -> Optional[str]:
+        """Return a cached outreach message younger than expiry_seconds, or None."""
+        oldest, now = self._valid_window(expiry_seconds)
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT message FROM messages WHERE cache_key = ? AND timestamp >= ? AND timestamp <= ?",
+            (cache_key, oldest, now)
+        ).fetchone()
+        if row is None:
+            return None
+        # Track reads so eviction drops the least recently used messages
+        conn.execute("UPDATE messages SET accessed = ? WHERE cache_key = ?", (now, cache_key))
+        return row[0]
+
+    def put_message(self, cache_key: str, linkedin_url: str, job_fingerprint: str, prompt_version: str,
+                    message: str, max_entries: int):
+        """Store an outreach message, evicting the least recently used ones beyond max_entries."""
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO messages "
+                "(cache_key, linkedin_url, job_fingerprint, prompt_version, message, timestamp, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (cache_key, linkedin_url, job_fingerprint, prompt_version, message, now, now)
+            )
+            excess = conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0] - max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM messages WHERE cache_key IN "
+                    "(SELECT cache_key FROM messages ORDER BY accessed LIMIT ?)",
+                    (excess,)
+                )
+
+    def get_job_page(self, job_id: str) -> Optional[Dict]:
+        """
+        Return the cached entry for a job page as a dict with the parsed "job",
+        its "etag" and "last_modified" validators, whether it was "rendered" by a
+        browser, and its "timestamp". None if the page was never cached.
+        """
+        row = self._connect().execute(
+            "SELECT job, etag, last_modified, rendered, timestamp FROM job_pages WHERE job_id = ?",
+            (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        job, etag, last_modified, rendered, timestamp = row
+        return {
+            "job": json.loads(job),
+            "etag": etag,
+            "last_modified": last_modified,
+            "rendered": bool(rendered),
+            "timestamp": timestamp,
+        }
+
+    def put_job_page(self, job_id: str, job: Dict, etag: Optional[str], last_modified: Optional[str],
+                     rendered: bool):
+        """Store a parsed job page with the validators of the response it came from."""
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO job_pages (job_id, job, etag, last_modified, rendered, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, json.dumps(job), etag, last_modified, int(rendered), time.time())
+            )
+
+    def iter_job_pages(self) -> Iterator[Dict]:
+        """Yield every cached parsed job, expired or not."""
+        for (job,) in self._connect().execute("SELECT job FROM job_pages"):
+            yield json.loads(job)
+
+    def touch_job_page(self, job_id: str):
+        """Mark a cached job page as revalidated now."""
+        conn = self._connect()
+        with conn:
+            conn.execute("UPDATE job_pages SET timestamp = ? WHERE job_id = ?", (time.time(), job_id))
+
+    def purge_expired(self) -> int:
+        """Delete expired profiles, queries, candidate features and finished runs. Returns the number removed."""
+        oldest, _ = self._valid_window()
+        oldest_query, _ = self._valid_window(self.query_expiry_seconds)
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if self.full_text_search:
+                conn.execute(
+                    "DELETE FROM profile_index WHERE rowid IN (SELECT rowid FROM profiles WHERE timestamp < ?)",
+                    (oldest,)
+                )
+            removed = conn.execute("DELETE FROM profiles WHERE timestamp < ?", (oldest,)).rowcount
+            removed += conn.execute("DELETE FROM queries WHERE timestamp < ?", (oldest_query,)).rowcount
+            removed += conn.execute("DELETE FROM features WHERE timestamp < ?", (oldest,)).rowcount
+            removed += conn.execute("DELETE FROM sourcing_runs WHERE finished < ?", (oldest,)).rowcount
+            return removed
+
+    def count(self) -> int:
+        """Number of stored profiles, expired or not."""
+        return self._connect().execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def migrate_from_pickle(self, pickle_path: str) -> int:
+        """
+        One-shot import of the legacy cache.pkl format
+        ({linkedin_url: {"profile": {...}, "timestamp": datetime}}).
+
+        Original timestamps are kept so expiry is unchanged. The pickle file is
+        renamed to <name>.migrated afterwards so the import never runs twice.
+        """
+        try:
+            with open(pickle_path, "rb") as f:
+                legacy = pickle.load(f)
+        except (FileNotFoundError, pickle.PickleError, EOFError):
+            return 0
+
+        rows = []
+        for url, entry in legacy.items():
+            timestamp = entry.get("timestamp")
+            if not url or not isinstance(timestamp, datetime):
+                continue
+            rows.append((url, CandidateRecord.from_dict(entry["profile"]), timestamp.timestamp()))
+
+        migrated = self._write_profiles(rows)
+        try:
+            os.replace(pickle_path, pickle_path + ".migrated")
+        except FileNotFoundError:
+            pass  # Another worker finished the migration first
+        return migrated
@@ -0,0 +1,214 @@
+import json
+import math
+import os
+import threading
+from itertools import repeat
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from .cache_store import STOPWORDS
+
+# Constants
+VOCABULARY_PATH = os.getenv("TFIDF_VOCABULARY", "tfidf_vocabulary.json")
+MAX_VOCABULARY = int(os.getenv("TFIDF_MAX_VOCABULARY", "50000"))
+# Smaller vocabularies are never saved or used; experience falls back to the keyword ladder
+MIN_VOCABULARY = int(os.getenv("TFIDF_MIN_VOCABULARY", "100"))
+VOCABULARY_FORMAT = 1
+# Cosine similarity that earns full marks; headlines are short, so even strong
+# matches share only part of a job description's weight
+FULL_MATCH_SIMILARITY = 0.5
+# Same range as the keyword ladder in score_experience_match
+MIN_SCORE = 2.0
+MAX_SCORE = 9.5
+
+# Marks text boundaries when a batch is tokenized as one string
+_BOUNDARY = "\x00"
+# Terms are runs of letters, digits and . + # (c++, c#, node.js, .net); every
+# other ASCII character separates them. Trailing dots are dropped ("corp." -> "corp").
+_SPLIT_TABLE = str.maketrans({
+    char: " " for char in map(chr, range(1, 128)) if not (char.isalnum() or char in ".+#")
+})
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase terms of a text, stopwords included."""
+    return (text.lower().translate(_SPLIT_TABLE) + " ").replace(". ", " ").split()
+
+
+def _batch_tokens(texts: Sequence[str]) -> List[str]:
+    """Terms of all texts in one pass, separated by _BOUNDARY."""
+    return tokenize(f" {_BOUNDARY} ".join(text.replace(_BOUNDARY, " ") for text in texts)) if texts else []
+
+
+class TfidfMatcher:
+    """
+    Sparse TF-IDF experience matching against a fixed vocabulary.
+
+    Texts become L2-normalized TF-IDF rows of one CSR matrix, so the cosine
+    similarity of a whole candidate batch to a job is a single sparse
+    matrix-vector product. Terms outside the vocabulary are ignored.
+    """
+
+    def __init__(self, terms: Sequence[str], idf: Sequence[float], documents: int = 0):
+        self.terms = list(terms)
+        self.vocabulary = {term: index for index, term in enumerate(self.terms)}
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.documents = documents
+        # Unknown terms map to one extra column with zero weight, boundaries to -1
+        self._weights = np.append(self.idf, 0.0)
+        self._lookup = dict(self.vocabulary)
+        self._lookup[_BOUNDARY] = -1
+
+    @classmethod
+    def fit(cls, texts: Iterable[str], max_terms: int = MAX_VOCABULARY) -> "TfidfMatcher":
+        """Build the vocabulary and smoothed IDF weights from a corpus."""
+        texts = list(texts)
+        codes = {_BOUNDARY: 0}
+        tokens = np.array([codes.setdefault(term, len(codes)) for term in _batch_tokens(texts)], dtype=np.int64)
+        boundaries = tokens == 0
+        rows = np.cumsum(boundaries)[~boundaries]
+
+        # Building the text-term matrix merges repeats, so each term counts once per text
+        occurrences = sparse.csr_matrix(
+            (np.ones(rows.shape[0]), (rows, tokens[~boundaries])), shape=(len(texts), len(codes))
+        )
+        document_frequency = np.bincount(occurrences.indices, minlength=len(codes))
+
+        counted = [(term, document_frequency[code]) for term, code in codes.items()
+                   if code and term not in STOPWORDS]
+        counted.sort(key=lambda item: -item[1])
+        terms = sorted(term for term, _ in counted[:max_terms])
+        frequency = dict(counted)
+        idf = [math.log((1 + len(texts)) / (1 + frequency[term])) + 1 for term in terms]
+        return cls(terms, idf, len(texts))
+
+    def transform(self, texts: Sequence[str]) -> sparse.csr_matrix:
+        """L2-normalized TF-IDF rows, one per text."""
+        tokens = _batch_tokens(texts)
+        unknown = len(self.terms)
+        columns = np.fromiter(map(self._lookup.get, tokens, repeat(unknown)), dtype=np.int64, count=len(tokens))
+        boundaries = columns == -1
+        rows = np.cumsum(boundaries)[~boundaries]
+        columns = columns[~boundaries]
+
+        # Duplicate (row, term) entries add up to tf * idf
+        matrix = sparse.csr_matrix(
+            (self._weights[columns], (rows, columns)), shape=(len(texts), unknown + 1)
+        )
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        matrix.data /= np.repeat(norms, np.diff(matrix.indptr))
+        return matrix
+
+    def similarities(self, texts: Sequence[str], job_texts: Sequence[str]) -> np.ndarray:
+        """Cosine similarity of every text to every job text, as an (n, jobs) array."""
+        return np.asarray((self.transform(texts) @ self.transform(job_texts).T).todense())
+
+    def scores(self, texts: Sequence[str], job_texts: Sequence[str]) -> np.ndarray:
+        """Experience scores of every text for every job, as an (n, jobs) array."""
+        return similarity_scores(self.similarities(texts, job_texts))
+
+    def save(self, path: str = VOCABULARY_PATH):
+        """Persist the vocabulary and IDF weights as JSON."""
+        data = {"format": VOCABULARY_FORMAT, "documents": self.documents, "terms": self.terms,
+                "idf": self.idf.tolist()}
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str = VOCABULARY_PATH) -> Optional["TfidfMatcher"]:
+        """Load a saved vocabulary, or None if there is none (or it is unreadable)."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if data.get("format") != VOCABULARY_FORMAT:
+                return None
+            return cls(data["terms"], data["idf"], data.get("documents", 0))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error loading TF-IDF vocabulary {path}: {e}")
+            return None
+
+
+def similarity_scores(similarity: np.ndarray) -> np.ndarray:
+    """
+    Map cosine similarities onto the experience scale (MIN_SCORE to MAX_SCORE),
+    rounded to one decimal so totals stay on a coarse grid.
+    """
+    scaled = np.minimum(similarity / FULL_MATCH_SIMILARITY, 1.0)
+    return np.round(MIN_SCORE + (MAX_SCORE - MIN_SCORE) * scaled, 1)
+
+
+def candidate_text(candidate: Dict) -> str:
+    """The candidate text matched against jobs."""
+    return candidate.get("headline") or ""
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_matcher() -> Optional[TfidfMatcher]:
+    """
+    Shared matcher with the vocabulary saved at VOCABULARY_PATH (see
+    rebuild_vocabulary), or None while there is no usable one.
+    """
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            matcher = TfidfMatcher.load()
+            if matcher is not None and len(matcher.terms) >= MIN_VOCABULARY:
+                _matcher = matcher
+        return _matcher
+
+
+def experience_scores(candidates: List[Dict], job_texts: Sequence[str]) -> Optional[np.ndarray]:
+    """
+    TF-IDF experience scores of every candidate for every job, as an (n, jobs) array.
+
+    Without a saved vocabulary one is fitted in memory on this batch's candidate
+    and job texts, used once and discarded. Returns None when that vocabulary is
+    smaller than MIN_VOCABULARY too; callers then use the keyword ladder.
+    """
+    texts = [candidate_text(candidate) for candidate in candidates]
+    matcher = get_matcher()
+    if matcher is None:
+        matcher = TfidfMatcher.fit([*texts, *job_texts])
+        if len(matcher.terms) < MIN_VOCABULARY:
+            return None
+    return matcher.scores(texts, job_texts)
+
+
+def rebuild_vocabulary(profiles: Iterable[Dict], job_texts: Iterable[str] = (),
+                       path: str = VOCABULARY_PATH) -> TfidfMatcher:
+    """
+    Fit a new vocabulary on profiles (and job texts), save it and use it from
+    now on. Raises ValueError if it would have fewer than MIN_VOCABULARY terms.
+    """
+    global _matcher
+    matcher = TfidfMatcher.fit([*(candidate_text(profile) for profile in profiles), *job_texts])
+    if len(matcher.terms) < MIN_VOCABULARY:
+        raise ValueError(
+            f"Only {len(matcher.terms)} terms in {matcher.documents} texts, at least {MIN_VOCABULARY} are needed"
+        )
+    matcher.save(path)
+    with _matcher_lock:
+        _matcher = matcher
+    return matcher
+
+
+if __name__ == "__main__":
+    # Fit the vocabulary on every cached profile and cached job page
+    from .search_linkedin import get_cache_store
+    store = get_cache_store()
+    try:
+        matcher = rebuild_vocabulary(store.iter_profiles(), (job.get("raw", "") for job in store.iter_job_pages()))
+    except ValueError as e:
+        print(f"TF-IDF vocabulary not saved: {e}")
+    else:
+        print(f"Saved {len(matcher.terms)} terms from {matcher.documents} texts to {VOCABULARY_PATH}")
@@ -1,20 +1,56 @@
+import hashlib
+import json
 import os
 import requests
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from pathlib import Path
+from ratelimit import limits, sleep_and_retry
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from . import metrics
+from .job_profile import JobProfile
+from .search_linkedin import get_cache_store
+from .single_flight import SingleFlight
 
 # Load environment variables from .env file
 env_path = Path(__file__).parent.parent / '.env'
 load_dotenv(env_path)
 
-def query_gemini(prompt: str) -> str:
+# Concurrent Gemini calls per generate_outreach call, and the shared API quota
+OUTREACH_CONCURRENCY = int(os.getenv("OUTREACH_CONCURRENCY", "4"))
+GEMINI_CALLS_PER_MINUTE = int(os.getenv("GEMINI_CALLS_PER_MINUTE", "15"))
+
+# Candidates per Gemini call when batching (1 = one call per candidate)
+OUTREACH_BATCH_SIZE = int(os.getenv("OUTREACH_BATCH_SIZE", "1"))
+BATCH_TOKENS_PER_MESSAGE = 150
+
+# Generated messages are cached per (candidate, job, prompt template). Bump
+# PROMPT_VERSION whenever build_outreach_prompt changes, and
+# BATCH_PROMPT_VERSION whenever build_batch_prompt does.
+PROMPT_VERSION = "1"
+BATCH_PROMPT_VERSION = "1-batch"
+OUTREACH_CACHE_EXPIRY_DAYS = float(os.getenv("OUTREACH_CACHE_EXPIRY_DAYS", "7"))
+OUTREACH_CACHE_MAX_ENTRIES = int(os.getenv("OUTREACH_CACHE_MAX_ENTRIES", "100000"))
+
+GEMINI_ERROR_PREFIX = "Error querying Gemini API:"
+
+# Pooled connections to the Gemini API, reused across calls and threads
+_session = requests.Session()
+_gemini_flights = SingleFlight("gemini")
+
+def query_gemini(prompt: str, max_output_tokens: int = 100, response_mime_type: Optional[str] = None) -> str:
     """Query Gemini API with the prompt"""
     API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent"
     headers = {"Content-Type": "application/json"}
     
+    generation_config = {"maxOutputTokens": max_output_tokens}
+    if response_mime_type:
+        generation_config["responseMimeType"] = response_mime_type
     data = {
         "contents": [{"parts": [{"text": prompt}]}],
-        "generationConfig": {"maxOutputTokens": 100}
+        "generationConfig": generation_config
     }
     
     try:
@@ -23,34 +59,35 @@ def query_gemini(prompt: str) -> str:
         if not api_key:
             raise ValueError("GEMINI_API_KEY not found in .env file")
         
-        response = requests.post(
-            f"{API_URL}?key={api_key}",
-            headers=headers,
-            json=data
-        )
-        response.raise_for_status()
-        
-        result = response.json()
+        with metrics.span("gemini_request"):
+            response = _session.post(
+                f"{API_URL}?key={api_key}",
+                headers=headers,
+                json=data
+            )
+            response.raise_for_status()
+
+            result = response.json()
+        metrics.external_call("gemini", "ok")
         return result["candidates"][0]["content"]["parts"][0]["text"].strip()
     
     except Exception as e:
-        return f"Error querying Gemini API: {str(e)}"
+        metrics.external_call("gemini", "error")
+        return f"{GEMINI_ERROR_PREFIX} {str(e)}"
 
-def generate_outreach(candidates: list, job_description: str) -> list:
-    """Generate personalized outreach messages for candidates"""
-    messages = []
-    for candidate in candidates:
-        name = candidate["name"]
-        headline = candidate.get("headline", "N/A")
+def build_outreach_prompt(candidate: Dict, job: JobProfile) -> str:
+    """Build the Gemini prompt for one candidate"""
+    name = candidate["name"]
+    headline = candidate.get("headline", "N/A")
 
-        prompt = f"""You are a technical recruiter writing a personalized LinkedIn message.
+    return f"""You are a technical recruiter writing a personalized LinkedIn message.
 
 Here is the candidate's profile:
 - Name: {name}
 - Headline: {headline}
 
 Here is the job description summary:
-{job_description}
+{job.description}
 
 Write a short, professional, and engaging message that:
 1. Mentions the candidate's role or current company
@@ -59,14 +96,197 @@ Write a short, professional, and engaging message that:
 
 Return only the message."""
 
-        message = query_gemini(prompt)
-        messages.append({
-            "candidate": name,
-            "message": message.strip()
-        })
-    
+def build_batch_prompt(candidates: List[Dict], job: JobProfile) -> str:
+    """Build one Gemini prompt asking for messages to several candidates as a JSON array"""
+    profiles = "\n".join(
+        f"{number}. Name: {candidate['name']} | Headline: {candidate.get('headline', 'N/A')}"
+        for number, candidate in enumerate(candidates, start=1)
+    )
+
+    return f"""You are a technical recruiter writing personalized LinkedIn messages.
+
+Here is the job description summary:
+{job.description}
+
+Here are the candidates' profiles:
+{profiles}
+
+For each candidate, write a short, professional, and engaging message that:
+1. Mentions the candidate's role or current company
+2. Explains why they're a good match for this role
+3. Sounds like it's coming from a real recruiter
+
+Return only a JSON array with one object per candidate, in the same order:
+[{{"candidate": <candidate number>, "message": "<message>"}}]"""
+
+@sleep_and_retry
+@limits(calls=GEMINI_CALLS_PER_MINUTE, period=60)
+def _throttled_query(prompt: str, **kwargs) -> str:
+    """query_gemini, blocking the calling thread while the per-minute quota is used up"""
+    return query_gemini(prompt, **kwargs)
+
+def _rate_limited_query(prompt: str, **kwargs) -> str:
+    """
+    _throttled_query, shared by concurrent calls with the same prompt and options
+    (the same candidate and job), so duplicate requests spend one call of the quota
+    """
+    return _gemini_flights.call((prompt, tuple(sorted(kwargs.items()))), _throttled_query, prompt, **kwargs)
+
+def outreach_cache_key(candidate: Dict, job: JobProfile, prompt_version: str = PROMPT_VERSION) -> str:
+    """Cache key for a candidate's message: linkedin_url, job fingerprint and prompt template version"""
+    identity = candidate.get("linkedin_url") or candidate["name"]
+    return hashlib.md5(f"{identity}|{job.fingerprint}|{prompt_version}".encode()).hexdigest()
+
+def _cached_message(candidate: Dict, job: JobProfile, prompt_version: str = PROMPT_VERSION) -> Optional[str]:
+    try:
+        message = get_cache_store().get_message(
+            outreach_cache_key(candidate, job, prompt_version), OUTREACH_CACHE_EXPIRY_DAYS * 24 * 3600
+        )
+    except sqlite3.Error as e:
+        print(f"Outreach cache read error: {str(e)}")
+        message = None
+    if message is None:
+        metrics.cache_result("message", misses=1)
+    else:
+        metrics.cache_result("message", hits=1)
+    return message
+
+def _remember_message(candidate: Dict, job: JobProfile, message: str, prompt_version: str = PROMPT_VERSION):
+    # Never cache failures; the next request should retry them
+    if not message or message.startswith(GEMINI_ERROR_PREFIX):
+        return
+    try:
+        get_cache_store().put_message(
+            outreach_cache_key(candidate, job, prompt_version),
+            candidate.get("linkedin_url", ""),
+            job.fingerprint,
+            prompt_version,
+            message,
+            OUTREACH_CACHE_MAX_ENTRIES
+        )
+    except sqlite3.Error as e:
+        # The message was generated; failing to cache it must not fail the request
+        print(f"Outreach cache write error: {str(e)}")
+
+def _outreach_message(candidate: Dict, job: JobProfile) -> Dict:
+    message = _cached_message(candidate, job)
+
+    if message is None:
+        message = _rate_limited_query(build_outreach_prompt(candidate, job)).strip()
+        _remember_message(candidate, job, message)
+
+    return {
+        "candidate": candidate["name"],
+        "message": message
+    }
+
+def _parse_batch_response(text: str, count: int) -> Dict[int, str]:
+    """
+    Extract {index: message} from a batch response, skipping malformed entries.
+    Candidate numbers are 1-based in the prompt.
+    """
+    text = text.strip()
+    if text.startswith("```"):
+        # Strip a markdown code fence around the JSON
+        text = text.strip("`").strip()
+        if text.lower().startswith("json"):
+            text = text[4:]
+    try:
+        entries = json.loads(text)
+    except ValueError:
+        return {}
+    if not isinstance(entries, list):
+        return {}
+
+    messages = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        number, message = entry.get("candidate"), entry.get("message")
+        if isinstance(number, str) and number.strip().isdigit():
+            number = int(number)
+        if not isinstance(number, int) or not 1 <= number <= count:
+            continue
+        if isinstance(message, str) and message.strip():
+            messages.setdefault(number - 1, message.strip())
     return messages
 
+def _outreach_batch(candidates: List[Dict], job: JobProfile) -> Dict[int, str]:
+    """Generate messages for several candidates in one Gemini call; returns {index: message}"""
+    response = _rate_limited_query(
+        build_batch_prompt(candidates, job),
+        max_output_tokens=BATCH_TOKENS_PER_MESSAGE * len(candidates) + 100,
+        response_mime_type="application/json"
+    )
+    if response.startswith(GEMINI_ERROR_PREFIX):
+        return {}
+    messages = _parse_batch_response(response, len(candidates))
+    for index, message in messages.items():
+        _remember_message(candidates[index], job, message, BATCH_PROMPT_VERSION)
+    return messages
+
+def _generate_batched(candidates: list, job: JobProfile, concurrency: int, batch_size: int) -> list:
+    messages = [_cached_message(candidate, job, BATCH_PROMPT_VERSION) for candidate in candidates]
+    pending = [index for index, message in enumerate(messages) if message is None]
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(batches) or 1))) as executor:
+        results = executor.map(lambda batch: _outreach_batch([candidates[i] for i in batch], job), batches)
+        for batch, batch_messages in zip(batches, results):
+            for position, message in batch_messages.items():
+                messages[batch[position]] = message
+
+        # Entries missing or malformed in a batch response fall back to single calls
+        missing = [index for index, message in enumerate(messages) if message is None]
+        for index, result in zip(missing, executor.map(lambda i: _outreach_message(candidates[i], job), missing)):
+            messages[index] = result["message"]
+
+    return [
+        {"candidate": candidate["name"], "message": message}
+        for candidate, message in zip(candidates, messages)
+    ]
+
+@metrics.timed("outreach")
+def generate_outreach(candidates: list, job_description: Union[str, List[str], Dict, JobProfile],
+                      concurrency: Optional[int] = None, batch_size: Optional[int] = None) -> list:
+    """
+    Generate personalized outreach messages for candidates
+
+    Up to `concurrency` Gemini calls run at once (defaults to OUTREACH_CONCURRENCY),
+    all sharing the GEMINI_CALLS_PER_MINUTE quota. With batch_size > 1 (defaults to
+    OUTREACH_BATCH_SIZE) each call covers that many candidates and returns JSON;
+    candidates missing from a batch response get a single call instead. Messages
+    are returned in the same order as candidates.
+    """
+    job = JobProfile.from_job(job_description)
+    concurrency = OUTREACH_CONCURRENCY if concurrency is None else concurrency
+    batch_size = OUTREACH_BATCH_SIZE if batch_size is None else batch_size
+    if batch_size > 1:
+        return _generate_batched(candidates, job, concurrency, batch_size)
+    if concurrency <= 1 or len(candidates) <= 1:
+        return [_outreach_message(candidate, job) for candidate in candidates]
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(candidates))) as executor:
+        return list(executor.map(lambda candidate: _outreach_message(candidate, job), candidates))
+
+def iter_outreach(candidates: list, job_description: Union[str, List[str], Dict, JobProfile],
+                  concurrency: Optional[int] = None) -> Iterator[Tuple[int, Dict]]:
+    """
+    Like generate_outreach, but yield (index, message) pairs as each message
+    completes, so callers can stream them instead of waiting for the slowest one.
+    """
+    if not candidates:
+        return
+    job = JobProfile.from_job(job_description)
+    concurrency = OUTREACH_CONCURRENCY if concurrency is None else concurrency
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(candidates)))) as executor:
+        futures = {
+            executor.submit(_outreach_message, candidate, job): index
+            for index, candidate in enumerate(candidates)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
 # Example usage (for testing)
 if __name__ == "__main__":
     # Test with mock data
@@ -0,0 +1,182 @@
+import re
+from typing import Dict, Optional
+
+# Field patterns in priority order, as used by the extract_* helpers in job_input.
+# Each has exactly one capturing group holding the value.
+FIELD_PATTERNS = {
+    "company": [
+        r'at\s+([A-Z][a-zA-Z\s&.,]+?)(?:\s+in|\s+is|\s+seeks|\s+looking|\s+hiring)',
+        r'([A-Z][a-zA-Z\s&.,]+?)\s+is\s+hiring',
+        r'Company:\s*([A-Z][a-zA-Z\s&.,]+)',
+        r'Employer:\s*([A-Z][a-zA-Z\s&.,]+)',
+    ],
+    "location": [
+        r'Location:\s*([A-Z][a-zA-Z\s,]+)',
+        r'in\s+([A-Z][a-zA-Z\s,]+?)(?:\s+is|\s+seeks|\s+looking)',
+        r'based\s+in\s+([A-Z][a-zA-Z\s,]+)',
+        r'remote\s+(?:from\s+)?([A-Z][a-zA-Z\s,]+)',
+        r'([A-Z][a-zA-Z\s,]+?)\s+\(Remote\)',
+    ],
+    "salary": [
+        r'\$(\d{1,3}(?:,\d{3})*(?:-\d{1,3}(?:,\d{3})*)?)\s*(?:per\s+)?(?:year|month|hour|week)',
+        r'Salary:\s*\$(\d{1,3}(?:,\d{3})*(?:-\d{1,3}(?:,\d{3})*)?)',
+        r'Compensation:\s*\$(\d{1,3}(?:,\d{3})*(?:-\d{1,3}(?:,\d{3})*)?)',
+        r'Pay:\s*\$(\d{1,3}(?:,\d{3})*(?:-\d{1,3}(?:,\d{3})*)?)',
+    ],
+    "experience": [
+        r'(\d+)\s*(?:to\s*\d+)?\s*years?\s*experience',
+        r'experience:\s*(\d+)\s*(?:to\s*\d+)?\s*years?',
+        r'(entry\s*level|junior|senior|lead|principal|executive)',
+        r'(intern|internship|graduate|new\s*grad)',
+    ],
+}
+
+# Cue that locates each pattern in the text. Most patterns start with their cue;
+# the two marked "before" end with it, so their value is searched for just before it.
+FIELD_CUES = {
+    ("company", 0): (r'at\s', "at"),
+    ("company", 1): (r'is\s+hiring', "before"),
+    ("company", 2): (r'company:', "at"),
+    ("company", 3): (r'employer:', "at"),
+    ("location", 0): (r'location:', "at"),
+    ("location", 1): (r'in\s', "at"),
+    ("location", 2): (r'based\s+in', "at"),
+    ("location", 3): (r'remote\s', "at"),
+    ("location", 4): (r'\(remote\)', "before"),
+    ("salary", 0): (r'\$\d', "at"),
+    ("salary", 1): (r'salary:', "at"),
+    ("salary", 2): (r'compensation:', "at"),
+    ("salary", 3): (r'pay:', "at"),
+    ("experience", 0): (r'\d+\s*(?:to\s*\d+)?\s*years?\s*experience', "at"),
+    ("experience", 1): (r'experience:', "at"),
+    ("experience", 2): (r'entry\s*level|junior|senior|lead|principal|executive', "at"),
+    ("experience", 3): (r'intern|graduate|new\s*grad', "at"),
+}
+
+# Characters a "before" value can be made of. The value starts at the first
+# letter of the run of these characters that ends at the cue.
+VALUE_CHARS = {
+    ("company", 1): r'[a-zA-Z\s&.,]',
+    ("location", 4): r'[a-zA-Z\s,]',
+}
+
+JOB_TYPES = ['full-time', 'part-time', 'contract', 'temporary', 'internship', 'freelance']
+
+COMMON_SKILLS = [
+    'Python', 'JavaScript', 'Java', 'C++', 'C#', 'PHP', 'Ruby', 'Go', 'Rust',
+    'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask', 'Spring',
+    'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Git', 'SQL', 'MongoDB',
+    'Machine Learning', 'AI', 'Data Science', 'DevOps', 'Agile', 'Scrum'
+]
+
+# Characters that lowercasing and re.IGNORECASE treat differently (e.g. the
+# dotless i matches 'i' case-insensitively but lowercases to itself)
+CASE_FOLD_EXCEPTIONS = re.compile('[\u0130\u0131\u017f\u212a]')
+
+
+class JobTextExtractor:
+    """
+    Extracts company, location, salary, job type, experience and skills from
+    job page text in a single pass.
+
+    All patterns are compiled once. One scan finds every cue (e.g. 'Company:',
+    'is hiring', '$', a skill name); each field pattern is then only tried at
+    its cues instead of at every position of the text. As with a plain
+    re.search, only the first match of each pattern counts, even when its value
+    is rejected. Keywords (job types and skills) must be whole words.
+    """
+
+    def __init__(self):
+        self.slots = list(FIELD_CUES)
+        self.patterns = {
+            slot: re.compile(FIELD_PATTERNS[slot[0]][slot[1]], re.IGNORECASE) for slot in self.slots
+        }
+        self.modes = {slot: mode for slot, (_, mode) in FIELD_CUES.items()}
+        self.value_runs = {slot: re.compile(f"{chars}*", re.IGNORECASE) for slot, chars in VALUE_CHARS.items()}
+
+        keywords = sorted({k.lower() for k in JOB_TYPES + COMMON_SKILLS}, key=len, reverse=True)
+        cues = "|".join(f"(?P<c{i}>{FIELD_CUES[slot][0]})" for i, slot in enumerate(self.slots))
+        any_cue = "|".join(cue for cue, _ in FIELD_CUES.values())
+        keyword = "(?<![a-z0-9])(?:" + "|".join(re.escape(k) for k in keywords) + ")(?![a-z0-9])"
+        # Keywords only start at word boundaries, cues anywhere (like the patterns
+        # they locate). At most one cue starts at any position, but a keyword may
+        # share it, so they are captured by separate optional lookaheads. The cue
+        # comes last, so lastindex names it whenever there is one
+        scanner = f"(?=(?:{any_cue})|{keyword})(?:(?=(?P<kw>{keyword})))?(?:(?={cues}))?"
+        # Case-insensitive matching is much slower, so the scan runs over lowercased
+        # text. The fallback covers the rare text with a character that lowercases
+        # differently from how case-insensitive patterns match it
+        self.scanner = re.compile(scanner)
+        self.fallback_scanner = re.compile(scanner, re.IGNORECASE)
+        self.cue_slots = {self.scanner.groupindex[f"c{i}"]: slot for i, slot in enumerate(self.slots)}
+
+        self.job_types = {job_type: job_type.title() for job_type in JOB_TYPES}
+        self.skills = {skill.lower(): skill for skill in COMMON_SKILLS}
+
+    def _match(self, slot, text: str, reversed_text: str, start: int, end: int):
+        pattern = self.patterns[slot]
+        if self.modes[slot] == "at":
+            return pattern.match(text, start)
+        # Step back over the run of value characters before the cue; no match
+        # can start further back than that
+        offset = len(text) - start
+        run = self.value_runs[slot].match(reversed_text, offset).end() - offset
+        return pattern.search(text, start - run, end)
+
+    @staticmethod
+    def _value(slot, match) -> Optional[str]:
+        value = match.group(1).strip()
+        if slot[0] in ("company", "location") and not 2 < len(value) < 100:
+            return None
+        if slot[0] == "salary":
+            return f"${value}"
+        return value
+
+    def extract(self, text: str) -> Dict:
+        """Return the company, location, salary, job_type, experience and skills found in text."""
+        first: Dict[tuple, Optional[str]] = {}  # (field, priority) -> value of the first match
+        keywords = set()
+        reversed_text = None
+
+        if not CASE_FOLD_EXCEPTIONS.search(text):
+            matches = self.scanner.finditer(text.lower())
+        else:
+            matches = self.fallback_scanner.finditer(text)
+
+        for match in matches:
+            keyword = match.group("kw")
+            if keyword is not None:
+                keywords.add(keyword.lower())
+            slot = self.cue_slots.get(match.lastindex)
+            if slot is not None and slot not in first:
+                if reversed_text is None and slot in VALUE_CHARS:
+                    reversed_text = text[::-1]
+                found = self._match(slot, text, reversed_text, match.start(), match.end(match.lastindex))
+                if found is not None:
+                    first[slot] = self._value(slot, found)
+
+        fields = {}
+        for field, patterns in FIELD_PATTERNS.items():
+            fields[field] = next(
+                (first[(field, priority)] for priority in range(len(patterns)) if first.get((field, priority))),
+                None
+            )
+        fields["job_type"] = next((title for key, title in self.job_types.items() if key in keywords), None)
+        fields["skills"] = [skill for key, skill in self.skills.items() if key in keywords]
+        return fields
+
+
+_extractor = None
+
+
+def get_extractor() -> JobTextExtractor:
+    """Shared extractor, compiled on first use."""
+    global _extractor
+    if _extractor is None:
+        _extractor = JobTextExtractor()
+    return _extractor
+
+
+def extract_job_fields(text: str) -> Dict:
+    """Extract all structured job fields from page text in one pass."""
+    return get_extractor().extract(text)
@@ -1,213 +1,204 @@
 import requests
-from bs4 import BeautifulSoup
 import hashlib
-import re
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+import importlib.util
+import os
 import time
 
+from . import metrics
+from .browser_pool import get_browser_pool
+from .job_extractor import extract_job_fields
+from .search_linkedin import get_cache_store
 
+# Constants
+STATIC_FETCH_TIMEOUT = 15
+MIN_STATIC_TEXT_LENGTH = 500  # Less visible text than this means a JS-rendered shell
+JOB_CACHE_EXPIRY_HOURS = float(os.getenv("JOB_CACHE_EXPIRY_HOURS", "24"))
+
+# lxml is much faster than the built-in parser when installed
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# Pooled connections for static page fetches
+_session = requests.Session()
+
+
+def parse_job_page(job_url, html):
+    """
+    Parses a job page's HTML into structured job information.
+    """
+    from bs4 import BeautifulSoup  # Imported on first use to keep package import cheap
+
+    soup = BeautifulSoup(html, HTML_PARSER)
+
+    # Extract basic structured info
+    title = soup.title.text.strip() if soup.title else ""
+    raw_text = soup.get_text(separator="\n")
+
+    # Basic heuristics
+    lines = [line.strip() for line in raw_text.splitlines() if line.strip()]
+    combined_text = " ".join(lines)
+
+    job_id = hashlib.md5(job_url.encode()).hexdigest()[:10]
+
+    # Extract company, location, salary, job type, experience and skills in one pass
+    fields = extract_job_fields(combined_text)
+
+    return {
+        "job_id": job_id,
+        "url": job_url,
+        "title": title,
+        "company": fields["company"],
+        "location": fields["location"],
+        "salary": fields["salary"],
+        "job_type": fields["job_type"],
+        "experience": fields["experience"],
+        "skills": fields["skills"],
+        "summary": lines[:20],
+        "raw": combined_text
+    }
+
+
+def looks_like_js_shell(job):
+    """True when a statically fetched page has too little text to be the rendered job"""
+    return len(job.get("raw", "")) < MIN_STATIC_TEXT_LENGTH
+
+
+def render_job_page(job_url):
+    """Render a job page in a pooled browser, waiting until it shows a job's worth of text, and parse it"""
+    with metrics.span("browser_render"):
+        return parse_job_page(job_url, get_browser_pool().fetch(job_url, min_text_length=MIN_STATIC_TEXT_LENGTH))
+
+
+@metrics.timed("job_fetch")
 def preprocess_job_description(job_url):
     """
     Downloads and parses a job page to extract metadata.
     Returns structured job information: title, location, summary, etc.
+
+    Tries a plain HTTP GET first and only renders the page in a browser when the
+    static HTML looks like an empty JavaScript shell. Parsed jobs are cached by
+    job_id: static pages are revalidated with ETag/Last-Modified (a 304 reuses
+    the cached job), browser-rendered ones are reused for JOB_CACHE_EXPIRY_HOURS.
     """
+    job_id = hashlib.md5(job_url.encode()).hexdigest()[:10]
+    store = get_cache_store()
+    cached = store.get_job_page(job_id)
+
+    headers = {}
+    if cached is not None:
+        # A rendered page's validators describe the JS shell, not the job, so only age counts
+        if cached["rendered"]:
+            if time.time() - cached["timestamp"] < JOB_CACHE_EXPIRY_HOURS * 3600:
+                metrics.cache_result("job_page", hits=1)
+                return cached["job"]
+            metrics.cache_result("job_page", expired=1)
+            cached = None
+        else:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+    else:
+        metrics.cache_result("job_page", misses=1)
+
     try:
-        # Use Selenium to get fully rendered page
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")  # Run in background
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-        driver.get(job_url)
-        
-        # Wait for page to load
-        time.sleep(3)
-        
-        # Get the fully rendered HTML
-        page_source = driver.page_source
-        driver.quit()
-        
-        soup = BeautifulSoup(page_source, "html.parser")
-
-        # Extract basic structured info
-        title = soup.title.text.strip() if soup.title else ""
-        raw_text = soup.get_text(separator="\n")
-
-        # Basic heuristics
-        lines = [line.strip() for line in raw_text.splitlines() if line.strip()]
-        combined_text = " ".join(lines)
-
-        job_id = hashlib.md5(job_url.encode()).hexdigest()[:10]
-
-        # Extract additional information using regex patterns
-        company = extract_company(combined_text)
-        location = extract_location(combined_text)
-        salary = extract_salary(combined_text)
-        job_type = extract_job_type(combined_text)
-        experience = extract_experience(combined_text)
-        skills = extract_skills(combined_text)
-
-        return {
-            "job_id": job_id,
-            "url": job_url,
-            "title": title,
-            "company": company,
-            "location": location,
-            "salary": salary,
-            "job_type": job_type,
-            "experience": experience,
-            "skills": skills,
-            "summary": lines[:20],
-            "raw": combined_text
-        }
+        response = _session.get(job_url, headers=headers, timeout=STATIC_FETCH_TIMEOUT)
+        if response.status_code == 304:
+            if cached is not None:
+                metrics.external_call("job_page", "ok")
+                metrics.cache_result("job_page", hits=1)
+                store.touch_job_page(job_id)
+                return cached["job"]
+            # Nothing cached to reuse (e.g. a proxy answered), so ask for the full page
+            response = _session.get(job_url, headers={"Cache-Control": "no-cache"}, timeout=STATIC_FETCH_TIMEOUT)
+            if response.status_code == 304:
+                raise requests.HTTPError("304 Not Modified for a page that is not cached", response=response)
+        response.raise_for_status()
+        job = parse_job_page(job_url, response.text)
     except Exception as e:
         print(f"Error: {e}")
-        # Fallback to requests if Selenium fails
+        metrics.external_call("job_page", "error")
+        # Fallback to the browser if the static fetch fails
         try:
-            response = requests.get(job_url)
-            soup = BeautifulSoup(response.text, "html.parser")
-            title = soup.title.text.strip() if soup.title else ""
-            raw_text = soup.get_text(separator="\n")
-            lines = [line.strip() for line in raw_text.splitlines() if line.strip()]
-            combined_text = " ".join(lines)
-            job_id = hashlib.md5(job_url.encode()).hexdigest()[:10]
-            
-            return {
-                "job_id": job_id,
-                "url": job_url,
-                "title": title,
-                "summary": lines[:20],
-                "raw": combined_text
-            }
+            job = render_job_page(job_url)
         except Exception as e2:
             print(f"Fallback also failed: {e2}")
+            metrics.external_call("browser", "error")
             return {"error": str(e2)}
+        store.put_job_page(job_id, job, None, None, True)
+        return job
+
+    metrics.external_call("job_page", "ok")
+    if cached is not None:
+        metrics.cache_result("job_page", expired=1)  # The page changed since it was cached
+    etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+    if not looks_like_js_shell(job):
+        store.put_job_page(job_id, job, etag, last_modified, False)
+        return job
+
+    # Escalate to a pooled Selenium browser to get the fully rendered page
+    try:
+        rendered_job = render_job_page(job_url)
+    except Exception as e:
+        # The static page is still better than nothing; it is not cached, so the next request renders again
+        print(f"Browser rendering failed, using the static page: {e}")
+        metrics.external_call("browser", "error")
+        return job
+    store.put_job_page(job_id, rendered_job, etag, last_modified, True)
+    return rendered_job
 
 
 def extract_company(text):
     """Extract company name from text"""
-    patterns = [
-        r'at\s+([A-Z][a-zA-Z\s&.,]+?)(?:\s+in|\s+is|\s+seeks|\s+looking|\s+hiring)',
-        r'([A-Z][a-zA-Z\s&.,]+?)\s+is\s+hiring',
-        r'Company:\s*([A-Z][a-zA-Z\s&.,]+)',
-        r'Employer:\s*([A-Z][a-zA-Z\s&.,]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            company = match.group(1).strip()
-            if len(company) > 2 and len(company) < 100:
-                return company
-    return None
+    return extract_job_fields(text)["company"]
 
 
 def extract_location(text):
     """Extract location from text"""
-    patterns = [
-        r'Location:\s*([A-Z][a-zA-Z\s,]+)',
-        r'in\s+([A-Z][a-zA-Z\s,]+?)(?:\s+is|\s+seeks|\s+looking)',
-        r'based\s+in\s+([A-Z][a-zA-Z\s,]+)',
-        r'remote\s+(?:from\s+)?([A-Z][a-zA-Z\s,]+)',
-        r'([A-Z][a-zA-Z\s,]+?)\s+\(Remote\)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            location = match.group(1).strip()
-            if len(location) > 2 and len(location) < 100:
-                return location
-    return None
+    return extract_job_fields(text)["location"]
 
 
 def extract_salary(text):
     """Extract salary information from text"""
-    patterns = [
-        r'\$(\d{1,3}(?:,\d{3})*(?:-\d{1,3}(?:,\d{3})*)?)\s*(?:per\s+)?(?:year|month|hour|week)',
-        r'Salary:\s*\$(\d{1,3}(?:,\d{3})*(?:-\d{1,3}(?:,\d{3})*)?)',
-        r'Compensation:\s*\$(\d{1,3}(?:,\d{3})*(?:-\d{1,3}(?:,\d{3})*)?)',
-        r'Pay:\s*\$(\d{1,3}(?:,\d{3})*(?:-\d{1,3}(?:,\d{3})*)?)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return f"${match.group(1)}"
-    return None
+    return extract_job_fields(text)["salary"]
 
 
 def extract_job_type(text):
     """Extract job type from text"""
-    job_types = ['full-time', 'part-time', 'contract', 'temporary', 'internship', 'freelance']
-    text_lower = text.lower()
-    
-    for job_type in job_types:
-        if job_type in text_lower:
-            return job_type.title()
-    return None
+    return extract_job_fields(text)["job_type"]
 
 
 def extract_experience(text):
     """Extract experience requirements from text"""
-    patterns = [
-        r'(\d+)\s*(?:to\s*\d+)?\s*years?\s*experience',
-        r'experience:\s*(\d+)\s*(?:to\s*\d+)?\s*years?',
-        r'(entry\s*level|junior|senior|lead|principal|executive)',
-        r'(intern|internship|graduate|new\s*grad)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-    return None
+    return extract_job_fields(text)["experience"]
 
 
 def extract_skills(text):
     """Extract skills from text"""
-    common_skills = [
-        'Python', 'JavaScript', 'Java', 'C++', 'C#', 'PHP', 'Ruby', 'Go', 'Rust',
-        'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask', 'Spring',
-        'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Git', 'SQL', 'MongoDB',
-        'Machine Learning', 'AI', 'Data Science', 'DevOps', 'Agile', 'Scrum'
-    ]
-    
-    found_skills = []
-    text_lower = text.lower()
-    
-    for skill in common_skills:
-        if skill.lower() in text_lower:
-            found_skills.append(skill)
-    
-    return found_skills
-
-# example usage
-job_url = "https://app.synapserecruiternetwork.com/job-page/1750452159644x262203891027542000"
-result = preprocess_job_description(job_url)
-
-print("Job ID:", result["job_id"])
-print("Title:", result["title"])
-
-if result.get("company"):
-    print("Company:", result["company"])
-if result.get("location"):
-    print("Location:", result["location"])
-if result.get("salary"):
-    print("Salary:", result["salary"])
-if result.get("job_type"):
-    print("Job Type:", result["job_type"])
-if result.get("experience"):
-    print("Experience:", result["experience"])
-if result.get("skills"):
-    print("Skills:", ", ".join(result["skills"]))
-
-print("Summary Preview:")
-print("\n".join(result["summary"]))
+    return extract_job_fields(text)["skills"]
+
+
+if __name__ == "__main__":
+    # example usage
+    job_url = "https://app.synapserecruiternetwork.com/job-page/1750452159644x262203891027542000"
+    result = preprocess_job_description(job_url)
+
+    print("Job ID:", result["job_id"])
+    print("Title:", result["title"])
+
+    if result.get("company"):
+        print("Company:", result["company"])
+    if result.get("location"):
+        print("Location:", result["location"])
+    if result.get("salary"):
+        print("Salary:", result["salary"])
+    if result.get("job_type"):
+        print("Job Type:", result["job_type"])
+    if result.get("experience"):
+        print("Experience:", result["experience"])
+    if result.get("skills"):
+        print("Skills:", ", ".join(result["skills"]))
+
+    print("Summary Preview:")
+    print("\n".join(result["summary"]))
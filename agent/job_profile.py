@@ -0,0 +1,40 @@
+import hashlib
+from typing import Dict, List, Union
+
+from .keywords import match_keywords
+
+
+class JobProfile:
+    """
+    Job-side inputs for scoring and outreach, computed once per request.
+
+    Holds the description as embedded in prompts, its normalized text, the
+    required-skill set, the location and a fingerprint of the normalized text.
+    """
+
+    def __init__(self, description: str, location: str = "", title: str = ""):
+        self.description = description
+        self.text = " ".join(description.lower().split())
+        self.location = location or ""
+        self.title = title or ""
+        self.skills = frozenset(match_keywords(self.text).get('skill', ()))
+        self.fingerprint = hashlib.md5(self.text.encode()).hexdigest()
+
+    @classmethod
+    def from_job(cls, job: Union["JobProfile", str, List[str], Dict]) -> "JobProfile":
+        """
+        Build a profile from a description string, the summary lines of a job,
+        or the dict returned by preprocess_job_description.
+        """
+        if isinstance(job, JobProfile):
+            return job
+        if isinstance(job, dict):
+            summary = job.get("summary")
+            description = "\n".join(summary) if summary else job.get("raw", "")
+            return cls(description, job.get("location") or "", job.get("title") or "")
+        if isinstance(job, list):
+            return cls("\n".join(job))
+        return cls(job or "")
+
+    def __repr__(self):
+        return f"JobProfile(fingerprint={self.fingerprint!r}, skills={len(self.skills)}, location={self.location!r})"
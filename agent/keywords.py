@@ -0,0 +1,132 @@
+import re
+from typing import Dict, Set
+
+
+# Keyword tables for the candidate rubric. They are compiled once into a single
+# matcher (see match_keywords) so each text is scanned only one time.
+ELITE_SCHOOLS = [
+    'mit', 'stanford', 'harvard', 'caltech', 'princeton', 'yale', 'columbia',
+    'university of pennsylvania', 'upenn', 'northwestern', 'duke', 'berkeley',
+    'uc berkeley', 'carnegie mellon', 'cmu', 'georgia tech', 'gatech'
+]
+
+STRONG_SCHOOLS = [
+    'ucla', 'usc', 'nyu', 'boston university', 'bu', 'university of michigan',
+    'umich', 'university of illinois', 'uiuc', 'university of texas', 'utexas',
+    'university of washington', 'uw', 'university of wisconsin', 'uw-madison'
+]
+
+INSTITUTIONS = ['university', 'college', 'institute']
+
+SENIOR_INDICATORS = ['senior', 'lead', 'principal', 'staff', 'director', 'manager', 'head of']
+JUNIOR_INDICATORS = ['junior', 'associate', 'entry', 'intern', 'graduate']
+
+TOP_TECH = [
+    'google', 'microsoft', 'apple', 'amazon', 'meta', 'facebook', 'netflix',
+    'tesla', 'nvidia', 'intel', 'amd', 'oracle', 'salesforce', 'adobe',
+    'uber', 'lyft', 'airbnb', 'stripe', 'square', 'palantir', 'databricks',
+    'snowflake', 'mongodb', 'atlassian', 'slack', 'zoom', 'shopify'
+]
+
+STRONG_TECH = [
+    'ibm', 'cisco', 'dell', 'hp', 'hewlett-packard', 'vmware', 'sap',
+    'workday', 'servicenow', 'splunk', 'elastic', 'confluent', 'hashicorp',
+    'gitlab', 'github', 'docker', 'kubernetes', 'red hat', 'canonical'
+]
+
+TECH_INDICATORS = ['software', 'technology', 'tech', 'engineering', 'development', 'programming']
+
+# Common programming languages and technologies
+SKILLS = [
+    'python', 'javascript', 'java', 'c++', 'c#', 'php', 'ruby', 'go', 'rust',
+    'react', 'angular', 'vue', 'node.js', 'django', 'flask', 'spring',
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'git', 'sql', 'mongodb',
+    'machine learning', 'ai', 'data science', 'devops', 'agile', 'scrum',
+    'typescript', 'html', 'css', 'bootstrap', 'jquery', 'express', 'fastapi',
+    'postgresql', 'mysql', 'redis', 'elasticsearch', 'kafka', 'rabbitmq',
+    'jenkins', 'github actions', 'terraform', 'ansible', 'puppet', 'chef'
+]
+
+METRO_AREAS = {
+    'san francisco': ['san francisco', 'oakland', 'san jose', 'palo alto', 'mountain view'],
+    'new york': ['new york', 'brooklyn', 'queens', 'manhattan', 'bronx'],
+    'los angeles': ['los angeles', 'hollywood', 'beverly hills', 'santa monica'],
+    'seattle': ['seattle', 'bellevue', 'redmond', 'kirkland'],
+    'austin': ['austin', 'round rock', 'cedar park'],
+    'boston': ['boston', 'cambridge', 'somerville', 'brookline']
+}
+
+REMOTE_INDICATORS = ['remote', 'work from home', 'wfh', 'virtual', 'distributed']
+
+KEYWORD_TABLES = {
+    'elite_school': ELITE_SCHOOLS,
+    'strong_school': STRONG_SCHOOLS,
+    'institution': INSTITUTIONS,
+    'senior': SENIOR_INDICATORS,
+    'junior': JUNIOR_INDICATORS,
+    'top_tech': TOP_TECH,
+    'strong_tech': STRONG_TECH,
+    'tech': TECH_INDICATORS,
+    'skill': SKILLS,
+    'remote': REMOTE_INDICATORS,
+}
+KEYWORD_TABLES.update({f"metro:{metro}": cities for metro, cities in METRO_AREAS.items()})
+
+# Degree markers are patterns rather than literal keywords
+DEGREE_PATTERNS = {
+    'bachelor': [r'bachelor\w*', r'b\.?s\.?', r'b\.?a\.?'],
+    'graduate': [r'master\w*', r'm\.?s\.?', r'm\.?a\.?', r'ph\.?d\.?', r'doctorate'],
+}
+
+
+def _build_keyword_matcher():
+    """
+    Compile every keyword table into one regex.
+
+    Each alternative sits inside a lookahead, so a match is attempted at every
+    word start without consuming text and overlapping keywords (e.g. 'uc berkeley'
+    and 'berkeley') are all reported. Keywords must be whole words: 'go' no longer
+    matches inside 'google', nor 'ai' inside 'maintain'.
+    """
+    categories: Dict[str, Set[str]] = {}
+    for category, keywords in KEYWORD_TABLES.items():
+        for keyword in keywords:
+            categories.setdefault(keyword, set()).add(category)
+
+    # Longest first so 'github actions' wins over 'github' at the same position
+    literals = sorted(categories, key=len, reverse=True)
+
+    # A longer keyword also implies any keyword that is a whole-word prefix of it
+    implied = {}
+    for keyword in literals:
+        implied[keyword] = [
+            other for other in literals
+            if other != keyword and keyword.startswith(other) and not keyword[len(other)].isalnum()
+        ]
+
+    alternatives = ["(?P<keyword>" + "|".join(re.escape(k) for k in literals) + ")"]
+    for category, patterns in DEGREE_PATTERNS.items():
+        alternatives.append(f"(?P<{category}>" + "|".join(patterns) + ")")
+
+    pattern = re.compile(r"(?<![a-z0-9])(?=(?:" + "|".join(alternatives) + r")(?![a-z0-9]))")
+    return pattern, categories, implied
+
+
+_KEYWORD_PATTERN, _KEYWORD_CATEGORIES, _IMPLIED_KEYWORDS = _build_keyword_matcher()
+
+
+def match_keywords(text: str) -> Dict[str, Set[str]]:
+    """
+    Scan text once and return every rubric keyword found, grouped by category.
+    """
+    hits: Dict[str, Set[str]] = {}
+    for match in _KEYWORD_PATTERN.finditer(text.lower()):
+        keyword = match.group('keyword')
+        if keyword is not None:
+            for found in (keyword, *_IMPLIED_KEYWORDS[keyword]):
+                for category in _KEYWORD_CATEGORIES[found]:
+                    hits.setdefault(category, set()).add(found)
+        else:
+            category = match.lastgroup
+            hits.setdefault(category, set()).add(match.group(category))
+    return hits
@@ -0,0 +1,186 @@
+import bisect
+import functools
+import inspect
+import os
+import threading
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+# Constants
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1").lower() not in ("0", "false", "no")
+METRICS_PREFIX = "synapse"
+# Upper bounds (seconds) of the stage latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_lock = threading.Lock()
+_counters: Dict[Tuple[str, tuple], float] = {}  # (name, labels) -> value
+_histograms: Dict[str, list] = {}  # stage -> [bucket counts..., count, sum]
+_help = {
+    "cache_requests_total": "Cache lookups by cache and result (hit, miss, expired).",
+    "external_requests_total": "Calls to external APIs by service and outcome (ok, retry, error).",
+    "coalesced_requests_total": "Calls served by an identical call already in flight, by operation.",
+}
+
+# Per-request stage durations for the Server-Timing header: stage -> [total seconds, count]
+_request_timings: ContextVar[Optional[Dict[str, list]]] = ContextVar("request_timings", default=None)
+
+_NOOP = nullcontext()
+
+
+def inc(name: str, value: float = 1, **labels):
+    """Add to a counter, e.g. inc("cache_requests_total", cache="profile", result="hit")."""
+    if not METRICS_ENABLED:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def cache_result(cache: str, hits: int = 0, misses: int = 0, expired: int = 0):
+    """Count the outcome of cache lookups in one call."""
+    if not METRICS_ENABLED:
+        return
+    for result, value in (("hit", hits), ("miss", misses), ("expired", expired)):
+        if value:
+            inc("cache_requests_total", value, cache=cache, result=result)
+
+
+def external_call(service: str, outcome: str):
+    """Count a call to an external API: outcome is "ok", "retry" or "error"."""
+    inc("external_requests_total", service=service, outcome=outcome)
+
+
+def observe(stage: str, seconds: float):
+    """Record how long one run of a pipeline stage took."""
+    if not METRICS_ENABLED:
+        return
+    with _lock:
+        histogram = _histograms.get(stage)
+        if histogram is None:
+            histogram = _histograms[stage] = [0] * (len(LATENCY_BUCKETS) + 2) + [0.0]
+        histogram[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        histogram[-2] += 1
+        histogram[-1] += seconds
+
+    timings = _request_timings.get()
+    if timings is not None:
+        with _lock:
+            entry = timings.setdefault(stage, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+
+class _Span:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+def span(stage: str):
+    """
+    Context manager timing a pipeline stage, e.g. `with span("scoring"): ...`.
+    Returns a shared no-op context when metrics are disabled.
+    """
+    return _Span(stage) if METRICS_ENABLED else _NOOP
+
+
+def timed(stage: str):
+    """
+    Decorator timing every call of a function (sync or async) as a pipeline stage.
+    The function is returned undecorated when metrics are disabled.
+    """
+    def decorator(func):
+        if not METRICS_ENABLED:
+            return func
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with _Span(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def start_request():
+    """Begin collecting stage timings for the current request; pass the token to end_request()."""
+    return _request_timings.set({})
+
+
+def end_request(token) -> str:
+    """Stop collecting and return the request's Server-Timing header value ("" if none)."""
+    timings = _request_timings.get()
+    _request_timings.reset(token)
+    if not timings:
+        return ""
+    return ", ".join(
+        f'{stage};dur={seconds * 1000:.1f};desc="{count}x"' if count > 1 else f"{stage};dur={seconds * 1000:.1f}"
+        for stage, (seconds, count) in timings.items()
+    )
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    with _lock:
+        counters = dict(_counters)
+        histograms = {stage: list(values) for stage, values in _histograms.items()}
+
+    lines = []
+    for name in sorted({name for name, _ in counters}):
+        metric = f"{METRICS_PREFIX}_{name}"
+        if name in _help:
+            lines.append(f"# HELP {metric} {_help[name]}")
+        lines.append(f"# TYPE {metric} counter")
+        for (counter, labels), value in sorted(counters.items()):
+            if counter == name:
+                lines.append(f"{metric}{_format_labels(labels)} {_format_value(value)}")
+
+    if histograms:
+        metric = f"{METRICS_PREFIX}_stage_duration_seconds"
+        lines.append(f"# HELP {metric} Duration of pipeline stages.")
+        lines.append(f"# TYPE {metric} histogram")
+        for stage, values in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), values):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f'{metric}_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{stage="{stage}"}} {values[-1]:.6f}')
+            lines.append(f'{metric}_count{{stage="{stage}"}} {values[-2]}')
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    """Clear all collected metrics."""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
@@ -0,0 +1,143 @@
+import json
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Union
+
+# Profile fields, in the order they are stored
+PROFILE_FIELDS = ("name", "linkedin_url", "headline", "current_company", "location")
+# Component order shared by the breakdown, the weights and the batch matrix columns
+COMPONENTS = (
+    "education",
+    "career_trajectory",
+    "company_relevance",
+    "experience_match",
+    "location_match",
+    "tenure",
+)
+SCORED_FIELDS = ("name", "linkedin_url", "headline", "score", "breakdown")
+
+_PROFILE_FIELD_SET = frozenset(PROFILE_FIELDS)
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def _intern(value) -> str:
+    return sys.intern(str(value)) if value else ""
+
+
+class CandidateRecord(Mapping):
+    """
+    Compact candidate profile with one slot per field.
+
+    Company and location strings are interned, since many candidates share
+    them. Reads like the profile dict it replaces (get, [], in, keys, dict())
+    and converts back with to_dict().
+    """
+    __slots__ = PROFILE_FIELDS
+
+    def __init__(self, name: str = "", linkedin_url: str = "", headline: str = "",
+                 current_company: str = "", location: str = ""):
+        self.name = name or ""
+        self.linkedin_url = linkedin_url or ""
+        self.headline = headline or ""
+        self.current_company = _intern(current_company)
+        self.location = _intern(location)
+
+    @classmethod
+    def from_dict(cls, profile: Mapping) -> "CandidateRecord":
+        """Record for a profile dict (records are returned as they are)."""
+        if isinstance(profile, cls):
+            return profile
+        return cls(*(profile.get(field) for field in PROFILE_FIELDS))
+
+    def encode(self) -> str:
+        """Compact JSON for the cache store: the fields as an array, in PROFILE_FIELDS order."""
+        return _ENCODER.encode([self.name, self.linkedin_url, self.headline, self.current_company, self.location])
+
+    @classmethod
+    def _from_value(cls, value) -> "CandidateRecord":
+        return cls(*value) if isinstance(value, list) else cls.from_dict(value)
+
+    @classmethod
+    def decode(cls, data: str) -> "CandidateRecord":
+        """Inverse of encode(); also reads profiles stored as JSON objects."""
+        return cls._from_value(json.loads(data))
+
+    @classmethod
+    def decode_many(cls, data: Iterable[str]) -> List["CandidateRecord"]:
+        """decode() for many stored profiles, parsed as one JSON document."""
+        return [cls._from_value(value) for value in json.loads("[" + ",".join(data) + "]")]
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in _PROFILE_FIELD_SET else default
+
+    def __getitem__(self, key):
+        if key not in _PROFILE_FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in _PROFILE_FIELD_SET
+
+    def __iter__(self):
+        return iter(PROFILE_FIELDS)
+
+    def __len__(self):
+        return len(PROFILE_FIELDS)
+
+    def to_dict(self) -> Dict[str, str]:
+        return {field: getattr(self, field) for field in PROFILE_FIELDS}
+
+    def __repr__(self):
+        return f"CandidateRecord({self.to_dict()!r})"
+
+
+class ScoredCandidate(Mapping):
+    """
+    A scored candidate: the profile it was scored from (referenced, not copied),
+    the overall score and the COMPONENTS breakdown as a float array.
+
+    Reads like the dict score_candidates used to return, and to_dict() gives
+    that shape ({"name", "linkedin_url", "headline", "score", "breakdown"}).
+    """
+    __slots__ = ("candidate", "score", "components")
+
+    def __init__(self, candidate: Union[Mapping, CandidateRecord], score: float, components: Iterable[float]):
+        self.candidate = candidate
+        self.score = score
+        self.components = array("d", components)
+
+    @property
+    def breakdown(self) -> Dict[str, float]:
+        return dict(zip(COMPONENTS, self.components))
+
+    def get(self, key, default=None):
+        if key == "score":
+            return self.score
+        if key == "breakdown":
+            return self.breakdown
+        if key == "name":
+            return self.candidate.get("name", "Unknown")
+        if key in ("linkedin_url", "headline"):
+            return self.candidate.get(key, "")
+        return default
+
+    def __getitem__(self, key):
+        if key not in SCORED_FIELDS:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __contains__(self, key):
+        return key in SCORED_FIELDS
+
+    def __iter__(self):
+        return iter(SCORED_FIELDS)
+
+    def __len__(self):
+        return len(SCORED_FIELDS)
+
+    def to_dict(self) -> Dict:
+        return {key: self.get(key) for key in SCORED_FIELDS}
+
+    def __repr__(self):
+        return f"ScoredCandidate({self.to_dict()!r})"
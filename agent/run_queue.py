@@ -0,0 +1,112 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from .cache_store import CacheStore
+
+# Sourcing runs executed at once, and how many may be queued or running before submissions are refused
+RUN_WORKERS = int(os.getenv("RUN_WORKERS", "2"))
+RUN_QUEUE_MAX = int(os.getenv("RUN_QUEUE_MAX", "20"))
+# Live queues refresh their runs' heartbeat this often; runs without one for RUN_STALE_SECONDS are failed
+RUN_HEARTBEAT_SECONDS = float(os.getenv("RUN_HEARTBEAT_SECONDS", "30"))
+RUN_STALE_SECONDS = float(os.getenv("RUN_STALE_SECONDS", "120"))
+
+INTERRUPTED_ERROR = "Interrupted: the worker process running it stopped"
+
+
+class RunQueue:
+    """
+    Bounded local worker pool for long sourcing runs.
+
+    submit() records the run in the store and returns its id at once; RUN_WORKERS
+    threads execute runner(request) in submission order and store the result or
+    error. At most max_pending runs may be queued or running in this process;
+    beyond that submit() refuses new ones so load is shed instead of piling up.
+    Runs live in the shared store, so any API worker process can report them.
+
+    Each queue heartbeats its unfinished runs every heartbeat_seconds and fails
+    any run, whoever owns it, that has gone stale_seconds without one, so runs
+    of a process that died (or a container that was replaced) do not stay
+    "queued" or "running" forever.
+    """
+
+    def __init__(self, store: CacheStore, runner: Callable[[Dict], Dict],
+                 workers: int = RUN_WORKERS, max_pending: int = RUN_QUEUE_MAX,
+                 heartbeat_seconds: float = RUN_HEARTBEAT_SECONDS, stale_seconds: float = RUN_STALE_SECONDS):
+        self.store = store
+        self.runner = runner
+        self.max_pending = max_pending
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_seconds = stale_seconds
+        # PIDs repeat across containers (uvicorn is PID 1 in every one), so the owner is unique per instance
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+        self._executor = ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="sourcing-run")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stopped = threading.Event()
+        threading.Thread(target=self._heartbeat, name="sourcing-run-heartbeat", daemon=True).start()
+
+    def _heartbeat(self):
+        while not self._stopped.wait(self.heartbeat_seconds):
+            try:
+                if self.pending:
+                    self.store.heartbeat_runs(self.owner)
+                self.recover()
+            except sqlite3.Error as e:
+                print(f"Sourcing run heartbeat error: {str(e)}")
+
+    def recover(self) -> int:
+        """Fail runs whose owner stopped heartbeating them. Returns the number failed."""
+        return self.store.fail_stale_runs(time.time() - self.stale_seconds, INTERRUPTED_ERROR)
+
+    @property
+    def pending(self) -> int:
+        """Runs queued or running in this process."""
+        with self._lock:
+            return self._pending
+
+    def submit(self, request: Dict) -> Optional[str]:
+        """Queue a run for request and return its id, or None if the queue is full."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                return None
+            self._pending += 1
+        run_id = uuid.uuid4().hex
+        try:
+            self.store.create_run(run_id, request, self.owner)
+            self._executor.submit(self._execute, run_id, request)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        return run_id
+
+    def _execute(self, run_id: str, request: Dict):
+        try:
+            self.store.start_run(run_id)
+            started = time.perf_counter()
+            try:
+                result = self.runner(request)
+            except Exception as e:
+                traceback.print_exc()
+                self.store.finish_run(run_id, "failed", error=str(e) or type(e).__name__)
+            else:
+                print(f"Sourcing run {run_id} finished in {time.perf_counter() - started:.1f}s")
+                self.store.finish_run(run_id, "succeeded", result=result)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def get(self, run_id: str) -> Optional[Dict]:
+        """Status, timestamps and result (or error) of a run, or None if unknown."""
+        return self.store.get_run(run_id)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+        self._stopped.set()
@@ -1,62 +1,62 @@
+import hashlib
+import json
+import os
 import re
-from typing import List, Dict, Any
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import List, Dict, FrozenSet, NamedTuple, Optional, Set, Tuple, Union
 
+import numpy as np
 
-def score_education(candidate_info: str) -> float:
+from . import metrics
+from .keywords import match_keywords
+from .job_profile import JobProfile
+from .records import COMPONENTS, ScoredCandidate
+
+
+_DURATION_PATTERN = re.compile(r'(\d+)\s*(?:year|yr|month|week)s?')
+
+
+def score_education(candidate_info: str, hits: Optional[Dict[str, Set[str]]] = None) -> float:
     """
     Score education based on school prestige and progression.
     Returns score 0-10.
     """
-    text = candidate_info.lower()
-    
-    # Elite schools
-    elite_schools = [
-        'mit', 'stanford', 'harvard', 'caltech', 'princeton', 'yale', 'columbia',
-        'university of pennsylvania', 'upenn', 'northwestern', 'duke', 'berkeley',
-        'uc berkeley', 'carnegie mellon', 'cmu', 'georgia tech', 'gatech'
-    ]
-    
-    # Strong schools
-    strong_schools = [
-        'ucla', 'usc', 'nyu', 'boston university', 'bu', 'university of michigan',
-        'umich', 'university of illinois', 'uiuc', 'university of texas', 'utexas',
-        'university of washington', 'uw', 'university of wisconsin', 'uw-madison'
-    ]
+    if hits is None:
+        hits = match_keywords(candidate_info)
     
     # Check for elite schools
-    for school in elite_schools:
-        if school in text:
-            return 9.5
+    if 'elite_school' in hits:
+        return 9.5
     
     # Check for strong schools
-    for school in strong_schools:
-        if school in text:
-            return 7.5
+    if 'strong_school' in hits:
+        return 7.5
     
     # Check for clear progression (bachelor's to master's/PhD)
-    if re.search(r'(bachelor|b\.?s\.?|b\.?a\.?)', text) and re.search(r'(master|m\.?s\.?|m\.?a\.?|ph\.?d|doctorate)', text):
+    if 'bachelor' in hits and 'graduate' in hits:
         return 8.5
     
     # Standard universities
-    if re.search(r'university|college|institute', text):
+    if 'institution' in hits:
         return 5.5
     
     return 3.0
 
 
-def score_career_trajectory(candidate_info: str) -> float:
+def score_career_trajectory(candidate_info: str, hits: Optional[Dict[str, Set[str]]] = None) -> float:
     """
     Score career trajectory based on job progression.
     Returns score 0-10.
     """
-    text = candidate_info.lower()
+    if hits is None:
+        hits = match_keywords(candidate_info)
     
     # Look for progression indicators
-    senior_indicators = ['senior', 'lead', 'principal', 'staff', 'director', 'manager', 'head of']
-    junior_indicators = ['junior', 'associate', 'entry', 'intern', 'graduate']
-    
-    senior_count = sum(1 for indicator in senior_indicators if indicator in text)
-    junior_count = sum(1 for indicator in junior_indicators if indicator in text)
+    senior_count = len(hits.get('senior', ()))
+    junior_count = len(hits.get('junior', ()))
     
     # Steady growth (more senior positions)
     if senior_count >= 2:
@@ -69,71 +69,45 @@ def score_career_trajectory(candidate_info: str) -> float:
         return 5.0  # Neutral
 
 
-def score_company_relevance(candidate_info: str) -> float:
+def score_company_relevance(candidate_info: str, hits: Optional[Dict[str, Set[str]]] = None) -> float:
     """
     Score company relevance based on tech industry presence.
     Returns score 0-10.
     """
-    text = candidate_info.lower()
-    
-    # Top tech companies
-    top_tech = [
-        'google', 'microsoft', 'apple', 'amazon', 'meta', 'facebook', 'netflix',
-        'tesla', 'nvidia', 'intel', 'amd', 'oracle', 'salesforce', 'adobe',
-        'uber', 'lyft', 'airbnb', 'stripe', 'square', 'palantir', 'databricks',
-        'snowflake', 'mongodb', 'atlassian', 'slack', 'zoom', 'shopify'
-    ]
-    
-    # Strong tech companies
-    strong_tech = [
-        'ibm', 'cisco', 'dell', 'hp', 'hewlett-packard', 'vmware', 'sap',
-        'workday', 'servicenow', 'splunk', 'elastic', 'confluent', 'hashicorp',
-        'gitlab', 'github', 'docker', 'kubernetes', 'red hat', 'canonical'
-    ]
+    if hits is None:
+        hits = match_keywords(candidate_info)
     
     # Check for top tech companies
-    for company in top_tech:
-        if company in text:
-            return 9.5
+    if 'top_tech' in hits:
+        return 9.5
     
     # Check for strong tech companies
-    for company in strong_tech:
-        if company in text:
-            return 7.5
+    if 'strong_tech' in hits:
+        return 7.5
     
     # Check for any tech-related experience
-    tech_indicators = ['software', 'technology', 'tech', 'engineering', 'development', 'programming']
-    if any(indicator in text for indicator in tech_indicators):
+    if 'tech' in hits:
         return 6.0
     
     return 4.0
 
 
-def score_experience_match(candidate_info: str, job_description: str) -> float:
+def score_experience_match(candidate_info: str, job_description: Union[str, List[str], JobProfile],
+                           hits: Optional[Dict[str, Set[str]]] = None) -> float:
     """
     Score experience match based on skill overlap.
     Returns score 0-10.
     """
-    candidate_text = candidate_info.lower()
-    job_text = " ".join(job_description).lower() if isinstance(job_description, list) else job_description.lower()
-    
-    # Common programming languages and technologies
-    skills = [
-        'python', 'javascript', 'java', 'c++', 'c#', 'php', 'ruby', 'go', 'rust',
-        'react', 'angular', 'vue', 'node.js', 'django', 'flask', 'spring',
-        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'git', 'sql', 'mongodb',
-        'machine learning', 'ai', 'data science', 'devops', 'agile', 'scrum',
-        'typescript', 'html', 'css', 'bootstrap', 'jquery', 'express', 'fastapi',
-        'postgresql', 'mysql', 'redis', 'elasticsearch', 'kafka', 'rabbitmq',
-        'jenkins', 'github actions', 'terraform', 'ansible', 'puppet', 'chef'
-    ]
+    if hits is None:
+        hits = match_keywords(candidate_info)
+    job_skills = JobProfile.from_job(job_description).skills
     
     # Count matching skills
-    matches = 0
-    for skill in skills:
-        if skill in candidate_text and skill in job_text:
-            matches += 1
-    
+    return _experience_score(len(job_skills.intersection(hits.get('skill', ()))))
+
+
+def _experience_score(matches: int) -> float:
+    """Experience match score for a number of skills shared with the job."""
     # Perfect skill match
     if matches >= 8:
         return 9.5
@@ -147,7 +121,17 @@ def score_experience_match(candidate_info: str, job_description: str) -> float:
         return 2.0
 
 
-def score_location_match(candidate_info: str, job_location: str = "") -> float:
+_CITY_PATTERN = re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s*(?:CA|NY|TX|FL|WA|MA|IL|PA|OH|GA|NC|VA|MI|NJ|CO|AZ|OR|TN|IN|MN|WI|MO|LA|AL|SC|KY|OK|CT|IA|NV|AR|MS|KS|UT|NE|ID|NH|ME|RI|MT|DE|SD|ND|AK|VT|WY|WV|HI)\b')
+
+
+@lru_cache(maxsize=256)
+def _job_metros(job_location: str) -> tuple:
+    """Metro areas mentioned in a job location (the job side never changes per call)."""
+    return tuple(category for category in match_keywords(job_location) if category.startswith('metro:'))
+
+
+def score_location_match(candidate_info: str, job_location: str = "",
+                         hits: Optional[Dict[str, Set[str]]] = None) -> float:
     """
     Score location match based on geographic proximity.
     Returns score 0-10.
@@ -155,12 +139,22 @@ def score_location_match(candidate_info: str, job_location: str = "") -> float:
     if not job_location:
         return 6.0  # Remote-friendly default
     
-    candidate_text = candidate_info.lower()
-    job_location_lower = job_location.lower()
+    if hits is None:
+        hits = match_keywords(candidate_info)
     
     # Extract city names from candidate info
-    city_pattern = r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s*(?:CA|NY|TX|FL|WA|MA|IL|PA|OH|GA|NC|VA|MI|NJ|CO|AZ|OR|TN|IN|MN|WI|MO|LA|AL|SC|KY|OK|CT|IA|NV|AR|MS|KS|UT|NE|ID|NH|ME|RI|MT|DE|SD|ND|AK|VT|WY|WV|HI)\b'
-    candidate_cities = re.findall(city_pattern, candidate_info)
+    candidate_cities = _CITY_PATTERN.findall(candidate_info)
+    return _location_score(candidate_cities, hits, 'remote' in hits, job_location)
+
+
+def _location_score(candidate_cities, candidate_metros, remote: bool, job_location: str) -> float:
+    """
+    Location match score from a candidate's cities, the metro categories it
+    mentions (anything supporting `in`) and whether it is open to remote work.
+    """
+    if not job_location:
+        return 6.0  # Remote-friendly default
+    job_location_lower = job_location.lower()
     
     # Exact city match
     for city in candidate_cities:
@@ -168,23 +162,11 @@ def score_location_match(candidate_info: str, job_location: str = "") -> float:
             return 10.0
     
     # Same metro area (simplified check)
-    metro_areas = {
-        'san francisco': ['san francisco', 'oakland', 'san jose', 'palo alto', 'mountain view'],
-        'new york': ['new york', 'brooklyn', 'queens', 'manhattan', 'bronx'],
-        'los angeles': ['los angeles', 'hollywood', 'beverly hills', 'santa monica'],
-        'seattle': ['seattle', 'bellevue', 'redmond', 'kirkland'],
-        'austin': ['austin', 'round rock', 'cedar park'],
-        'boston': ['boston', 'cambridge', 'somerville', 'brookline']
-    }
-    
-    for metro, cities in metro_areas.items():
-        if any(city in job_location_lower for city in cities):
-            if any(city in candidate_text for city in cities):
-                return 8.0
+    if any(metro in candidate_metros for metro in _job_metros(job_location)):
+        return 8.0
     
     # Remote indicators
-    remote_indicators = ['remote', 'work from home', 'wfh', 'virtual', 'distributed']
-    if any(indicator in candidate_text for indicator in remote_indicators):
+    if remote:
         return 6.0
     
     return 3.0
@@ -195,19 +177,8 @@ def score_tenure(candidate_info: str) -> float:
     Score tenure based on job duration patterns.
     Returns score 0-10.
     """
-    text = candidate_info.lower()
-    
-    # Look for duration patterns
-    duration_patterns = [
-        r'(\d+)\s*(?:year|yr)s?',
-        r'(\d+)\s*months?',
-        r'(\d+)\s*weeks?'
-    ]
-    
-    durations = []
-    for pattern in duration_patterns:
-        matches = re.findall(pattern, text)
-        durations.extend([int(match) for match in matches])
+    # Look for duration patterns (years, months and weeks in one pass)
+    durations = [int(match) for match in _DURATION_PATTERN.findall(candidate_info.lower())]
     
     if not durations:
         return 5.0  # Default if no duration info
@@ -229,7 +200,232 @@ def score_tenure(candidate_info: str) -> float:
         return 6.0  # Long tenure
 
 
-def score_candidates(candidates: List[Dict], job_description: str, job_location: str = "") -> List[Dict]:
+# Weights of the rubric components, in COMPONENTS order
+WEIGHTS = (0.20, 0.20, 0.15, 0.25, 0.10, 0.10)
+# Components that only depend on the candidate, computed once when scoring many jobs
+JOB_INDEPENDENT = ("education", "career_trajectory", "company_relevance", "tenure")
+
+# Bump whenever a component's logic or the keyword tables change, so cached
+# candidate features are recomputed instead of reused
+RUBRIC_VERSION = "1"
+# Keep candidate features in the cache store so rescoring only matches them against the job.
+# Off by default: with it on, scoring reads and writes the SQLite store.
+FEATURE_CACHE = os.getenv("FEATURE_CACHE", "0").lower() in ("1", "true", "yes")
+
+# How the batch engine scores experience: "keywords" (the skill ladder) or
+# "tfidf" (cosine similarity of headline and job text, see experience_matcher)
+EXPERIENCE_MATCHERS = ("keywords", "tfidf")
+EXPERIENCE_MATCHER = os.getenv("EXPERIENCE_MATCHER", "keywords")
+
+# Opt-in parallel scoring. Batches smaller than PARALLEL_MIN_CANDIDATES stay
+# serial since shipping candidates to worker processes would cost more than it saves.
+SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", "0"))
+PARALLEL_MIN_CANDIDATES = int(os.getenv("SCORING_PARALLEL_MIN_CANDIDATES", "5000"))
+PARALLEL_CHUNK_SIZE = 2000
+
+_pool = None
+_pool_workers = 0
+_pool_users = 0  # Callers currently mapping over _pool
+_pool_changed = threading.Condition()  # Guards the three above
+
+
+def _candidate_info(candidate: Dict) -> str:
+    """Combine candidate information for analysis"""
+    return f"{candidate.get('name', '')} {candidate.get('headline', '')} {candidate.get('linkedin_url', '')}"
+
+
+def _job_independent_scores(candidate_info: str, hits: Dict[str, Set[str]]) -> tuple:
+    """The components that do not depend on the job, in JOB_INDEPENDENT order."""
+    return (
+        score_education(candidate_info, hits),
+        score_career_trajectory(candidate_info, hits),
+        score_company_relevance(candidate_info, hits),
+        score_tenure(candidate_info),
+    )
+
+
+class CandidateFeatures(NamedTuple):
+    """
+    Everything scoring needs from one candidate: the JOB_INDEPENDENT component
+    scores, plus the skills, cities, metro areas and remote flag that experience
+    and location are matched on. Computing it is the expensive part of scoring.
+    """
+    education: float
+    career_trajectory: float
+    company_relevance: float
+    tenure: float
+    skills: FrozenSet[str]
+    cities: Tuple[str, ...]
+    metros: FrozenSet[str]
+    remote: bool
+
+    def encode(self) -> str:
+        """Compact JSON form for the cache store."""
+        return json.dumps(
+            [*self[:4], sorted(self.skills), list(self.cities), sorted(self.metros), self.remote],
+            separators=(",", ":")
+        )
+
+    @classmethod
+    def decode(cls, data: str) -> "CandidateFeatures":
+        education, trajectory, company, tenure, skills, cities, metros, remote = json.loads(data)
+        return cls(education, trajectory, company, tenure, frozenset(skills), tuple(cities), frozenset(metros), remote)
+
+
+def extract_features(candidate: Dict) -> CandidateFeatures:
+    """Scan a candidate's text once and extract its CandidateFeatures."""
+    candidate_info = _candidate_info(candidate)
+    hits = match_keywords(candidate_info)
+    return CandidateFeatures(
+        *_job_independent_scores(candidate_info, hits),
+        skills=frozenset(hits.get('skill', ())),
+        cities=tuple(_CITY_PATTERN.findall(candidate_info)),
+        metros=frozenset(category for category in hits if category.startswith('metro:')),
+        remote='remote' in hits,
+    )
+
+
+def _profile_hash(candidate: Dict) -> str:
+    """Fingerprint of the candidate fields scoring reads; cached features are only valid for it."""
+    return hashlib.md5(_candidate_info(candidate).encode()).hexdigest()
+
+
+def _component_row(features: CandidateFeatures, job: JobProfile, job_location: str = "") -> tuple:
+    """The six rubric components for one candidate's features, in COMPONENTS order."""
+    return (
+        features.education,
+        features.career_trajectory,
+        features.company_relevance,
+        _experience_score(len(job.skills.intersection(features.skills))),
+        _location_score(features.cities, features.metros, features.remote, job_location),
+        features.tenure,
+    )
+
+
+def _feature_chunk(candidates: List[Dict]) -> List[CandidateFeatures]:
+    """Features for a slice of candidates (runs in worker processes)."""
+    return [extract_features(candidate) for candidate in candidates]
+
+
+def _close_pool():
+    """Shut the shared pool down; the caller holds _pool_changed and nobody uses the pool."""
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+        _pool_workers = 0
+
+
+@contextmanager
+def _scoring_pool(workers: int):
+    """
+    Borrow the shared scoring pool, creating it on first use.
+
+    A pool with a different worker count is only replaced once no other
+    caller is using it, so nobody's map is cut short by a shutdown.
+    """
+    global _pool, _pool_workers, _pool_users
+    with _pool_changed:
+        while _pool_users and _pool_workers != workers:
+            _pool_changed.wait()
+        if _pool is None or _pool_workers != workers:
+            _close_pool()
+            _pool = ProcessPoolExecutor(max_workers=workers)
+            _pool_workers = workers
+        _pool_users += 1
+        pool = _pool
+    try:
+        yield pool
+    finally:
+        with _pool_changed:
+            _pool_users -= 1
+            _pool_changed.notify_all()
+
+
+def shutdown_scoring_pool():
+    """Stop the worker processes used for parallel scoring, if any, once no caller is using them."""
+    with _pool_changed:
+        _pool_changed.wait_for(lambda: not _pool_users)
+        _close_pool()
+
+
+def _all_features(candidates: List[Dict], workers: Optional[int] = None) -> List[CandidateFeatures]:
+    """
+    Extract features for every candidate, in input order.
+
+    With more than one worker and at least PARALLEL_MIN_CANDIDATES candidates the
+    list is split into chunks processed in a process pool; results are merged back
+    in chunk order so the output is identical to the serial path.
+    """
+    workers = SCORING_WORKERS if workers is None else workers
+    if workers <= 1 or len(candidates) < PARALLEL_MIN_CANDIDATES:
+        return _feature_chunk(candidates)
+    
+    # A few chunks per worker keeps the pool balanced without too much IPC
+    chunk_size = max(PARALLEL_CHUNK_SIZE, -(-len(candidates) // (workers * 4)))
+    chunks = [candidates[i:i + chunk_size] for i in range(0, len(candidates), chunk_size)]
+    
+    with _scoring_pool(workers) as pool:
+        return [features for chunk in pool.map(_feature_chunk, chunks) for features in chunk]
+
+
+def candidate_features(candidates: List[Dict], workers: Optional[int] = None,
+                       use_cache: Optional[bool] = None) -> List[CandidateFeatures]:
+    """
+    CandidateFeatures for every candidate, in input order.
+
+    With the feature cache on (use_cache defaults to FEATURE_CACHE), features
+    stored for a linkedin_url are reused while the profile hash and
+    RUBRIC_VERSION still match; the rest are extracted and stored.
+    """
+    use_cache = FEATURE_CACHE if use_cache is None else use_cache
+    if not use_cache:
+        return _all_features(candidates, workers)
+
+    # Imported here so scoring worker processes never load the HTTP/cache stack
+    from .search_linkedin import get_cache_store
+    store = get_cache_store()
+
+    keys = [(candidate.get("linkedin_url"), _profile_hash(candidate)) for candidate in candidates]
+    stored = store.get_features([url for url, _ in keys if url], RUBRIC_VERSION)
+    features = [None] * len(candidates)
+    missing = []
+    for index, (url, profile_hash) in enumerate(keys):
+        entry = stored.get(url) if url else None
+        if entry is not None and entry[0] == profile_hash:
+            features[index] = CandidateFeatures.decode(entry[1])
+        else:
+            missing.append(index)
+    metrics.cache_result("features", hits=len(candidates) - len(missing), misses=len(missing))
+
+    rows = []
+    for index, extracted in zip(missing, _all_features([candidates[i] for i in missing], workers)):
+        features[index] = extracted
+        url, profile_hash = keys[index]
+        if url:
+            rows.append((url, profile_hash, RUBRIC_VERSION, extracted.encode()))
+    store.put_features(rows)
+    return features
+
+
+def _all_component_scores(candidates: List[Dict], job: JobProfile, job_location: str,
+                          workers: Optional[int] = None, use_cache: Optional[bool] = None) -> List[tuple]:
+    """Component scores for every candidate, in input order."""
+    return [
+        _component_row(features, job, job_location)
+        for features in candidate_features(candidates, workers, use_cache)
+    ]
+
+
+def _scored_entry(candidate: Dict, components, score: float) -> ScoredCandidate:
+    """Build the scored candidate record returned to callers."""
+    return ScoredCandidate(candidate, score, [round(float(value), 2) for value in components])
+
+
+@metrics.timed("scoring")
+def score_candidates(candidates: List[Dict], job_description: Union[str, List[str], Dict, JobProfile],
+                     job_location: str = "", workers: Optional[int] = None,
+                     use_cache: Optional[bool] = None) -> List[ScoredCandidate]:
     """
     Assigns a fit score to each candidate based on the comprehensive rubric.
     
@@ -240,47 +436,193 @@ def score_candidates(candidates: List[Dict], job_description: str, job_location:
     - Experience Match: 25%
     - Location Match: 10%
     - Tenure: 10%
+    
+    job_description may be a string, summary lines, a job dict or a JobProfile;
+    job_location defaults to the profile's location. workers > 1 scores large
+    batches in a process pool (defaults to SCORING_WORKERS). use_cache reuses
+    cached candidate features (see candidate_features).
     """
+    job = JobProfile.from_job(job_description)
+    job_location = job_location or job.location
     scored = []
     
-    for candidate in candidates:
-        # Combine candidate information for analysis
-        candidate_info = f"{candidate.get('name', '')} {candidate.get('headline', '')} {candidate.get('linkedin_url', '')}"
-        
-        # Calculate individual scores
-        education_score = score_education(candidate_info)
-        trajectory_score = score_career_trajectory(candidate_info)
-        company_score = score_company_relevance(candidate_info)
-        experience_score = score_experience_match(candidate_info, job_description)
-        location_score = score_location_match(candidate_info, job_location)
-        tenure_score = score_tenure(candidate_info)
-        
+    for candidate, components in zip(candidates, _all_component_scores(candidates, job, job_location, workers, use_cache)):
         # Calculate weighted total score
-        total_score = (
-            education_score * 0.20 +
-            trajectory_score * 0.20 +
-            company_score * 0.15 +
-            experience_score * 0.25 +
-            location_score * 0.10 +
-            tenure_score * 0.10
-        )
+        total_score = 0.0
+        for value, weight in zip(components, WEIGHTS):
+            total_score += value * weight
         
-        scored.append({
-            "name": candidate.get("name", "Unknown"),
-            "linkedin_url": candidate.get("linkedin_url", ""),
-            "headline": candidate.get("headline", ""),
-            "score": round(total_score, 2),
-            "breakdown": {
-                "education": round(education_score, 2),
-                "career_trajectory": round(trajectory_score, 2),
-                "company_relevance": round(company_score, 2),
-                "experience_match": round(experience_score, 2),
-                "location_match": round(location_score, 2),
-                "tenure": round(tenure_score, 2)
-            }
-        })
+        scored.append(_scored_entry(candidate, components, round(total_score, 2)))
     
     # Sort by score in descending order
-    scored.sort(key=lambda x: x["score"], reverse=True)
+    scored.sort(key=lambda x: x.score, reverse=True)
     
-    return scored
\ No newline at end of file
+    return scored
+
+
+def _resolve_matcher(matcher: Optional[str]) -> str:
+    matcher = matcher or EXPERIENCE_MATCHER
+    if matcher not in EXPERIENCE_MATCHERS:
+        raise ValueError(f"Unknown experience matcher {matcher!r}; expected one of {', '.join(EXPERIENCE_MATCHERS)}")
+    return matcher
+
+
+def _tfidf_experience(candidates: List[Dict], jobs: List[JobProfile]) -> Optional[np.ndarray]:
+    """TF-IDF experience scores as an (n, jobs) array, or None without a usable vocabulary."""
+    # Imported here so scipy only loads when the TF-IDF matcher is selected
+    from .experience_matcher import experience_scores
+    return experience_scores(candidates, [job.text for job in jobs])
+
+
+def _weighted_totals(components: np.ndarray) -> np.ndarray:
+    """
+    Apply WEIGHTS to an (n, 6) component matrix.
+
+    Equivalent to components @ WEIGHTS, but accumulated column by column in the
+    same order as score_candidates so every total is bit-identical to it.
+    """
+    totals = np.zeros(components.shape[0], dtype=np.float64)
+    for column, weight in enumerate(WEIGHTS):
+        totals += components[:, column] * weight
+    return totals
+
+
+def _round_scores(totals: np.ndarray) -> np.ndarray:
+    """
+    Round totals to 2 decimals exactly like Python's round().
+
+    np.round can differ from round() on half-way values, which would change the
+    ranking. Totals only take a few hundred distinct values, so round those.
+    """
+    unique, inverse = np.unique(totals, return_inverse=True)
+    rounded = np.array([round(float(value), 2) for value in unique], dtype=np.float64)
+    return rounded[inverse]
+
+
+def _top_k_order(scores: np.ndarray, top_k: Optional[int] = None) -> np.ndarray:
+    """
+    Indices of the top_k scores, best first.
+
+    Ties keep input order, matching the stable sort used by score_candidates.
+    """
+    n = scores.shape[0]
+    if top_k is None or top_k >= n:
+        return np.argsort(-scores, kind="stable")
+    if top_k <= 0:
+        return np.empty(0, dtype=np.intp)
+    
+    # Find the k-th best score without sorting the whole pool
+    threshold = scores[np.argpartition(-scores, top_k - 1)[:top_k]].min()
+    above = np.flatnonzero(scores > threshold)
+    ties = np.flatnonzero(scores == threshold)[:top_k - above.shape[0]]
+    selected = np.sort(np.concatenate((above, ties)))
+    return selected[np.argsort(-scores[selected], kind="stable")]
+
+
+@metrics.timed("scoring")
+def score_candidates_batch(candidates: List[Dict], job_description: Union[str, List[str], Dict, JobProfile],
+                           job_location: str = "", top_k: Optional[int] = None,
+                           workers: Optional[int] = None, use_cache: Optional[bool] = None,
+                           matcher: Optional[str] = None) -> List[ScoredCandidate]:
+    """
+    Vectorized variant of score_candidates for large candidate pools.
+
+    Component scores are gathered into an (n, 6) matrix, weighted in one pass and
+    only the top_k candidates are selected and materialized. With the default
+    "keywords" matcher the ranking and values are identical to
+    score_candidates(...)[:top_k]; matcher="tfidf" scores experience by TF-IDF
+    similarity instead (defaults to EXPERIENCE_MATCHER).
+    """
+    matcher = _resolve_matcher(matcher)
+    if not candidates:
+        return []
+    
+    job = JobProfile.from_job(job_description)
+    job_location = job_location or job.location
+    components = np.array(
+        _all_component_scores(candidates, job, job_location, workers, use_cache), dtype=np.float64
+    ).reshape(len(candidates), len(COMPONENTS))
+    # Keyword experience scores stay in place when there is no usable TF-IDF vocabulary
+    tfidf = _tfidf_experience(candidates, [job]) if matcher == "tfidf" else None
+    if tfidf is not None:
+        components[:, COMPONENTS.index("experience_match")] = tfidf[:, 0]
+    scores = _round_scores(_weighted_totals(components))
+    
+    return [
+        _scored_entry(candidates[i], components[i], float(scores[i]))
+        for i in _top_k_order(scores, top_k)
+    ]
+
+
+def component_matrix(candidates: List[Dict], jobs: List[Union[str, List[str], Dict, JobProfile]],
+                     workers: Optional[int] = None, use_cache: Optional[bool] = None,
+                     matcher: Optional[str] = None) -> np.ndarray:
+    """
+    Component scores of every candidate against every job, as an (n, jobs, 6)
+    array in COMPONENTS order.
+
+    Candidate features are extracted (or loaded from the cache) once for the
+    whole pool; only experience and location are matched per job. With the
+    "tfidf" matcher the experience of the whole pool against all jobs is one
+    sparse matrix product.
+    """
+    matcher = _resolve_matcher(matcher)
+    profiles = [JobProfile.from_job(job) for job in jobs]
+    components = np.empty((len(candidates), len(profiles), len(COMPONENTS)), dtype=np.float64)
+    if not candidates:
+        return components
+
+    features = candidate_features(candidates, workers, use_cache)
+    independent = np.array([row[:len(JOB_INDEPENDENT)] for row in features], dtype=np.float64)
+    for index, name in enumerate(COMPONENTS):
+        if name in JOB_INDEPENDENT:
+            components[:, :, index] = independent[:, JOB_INDEPENDENT.index(name), None]
+
+    experience = COMPONENTS.index("experience_match")
+    location = COMPONENTS.index("location_match")
+    tfidf = _tfidf_experience(candidates, profiles) if matcher == "tfidf" else None
+    if tfidf is not None:
+        components[:, :, experience] = tfidf
+    for j, job in enumerate(profiles):
+        if tfidf is None:
+            components[:, j, experience] = [
+                _experience_score(len(job.skills.intersection(row.skills))) for row in features
+            ]
+        components[:, j, location] = [
+            _location_score(row.cities, row.metros, row.remote, job.location) for row in features
+        ]
+    return components
+
+
+def score_matrix(candidates: List[Dict], jobs: List[Union[str, List[str], Dict, JobProfile]],
+                 workers: Optional[int] = None, use_cache: Optional[bool] = None,
+                 matcher: Optional[str] = None) -> np.ndarray:
+    """Overall scores as an (n, jobs) array; entry [i, j] equals candidate i's score for job j alone."""
+    components = component_matrix(candidates, jobs, workers, use_cache, matcher)
+    scores = np.empty(components.shape[:2], dtype=np.float64)
+    for j in range(components.shape[1]):
+        scores[:, j] = _round_scores(_weighted_totals(components[:, j, :]))
+    return scores
+
+
+@metrics.timed("scoring")
+def score_candidates_multi(candidates: List[Dict], jobs: List[Union[str, List[str], Dict, JobProfile]],
+                           top_k: Optional[int] = None, workers: Optional[int] = None,
+                           use_cache: Optional[bool] = None, matcher: Optional[str] = None) -> List[List[ScoredCandidate]]:
+    """
+    Score one candidate pool against several jobs in a single pass.
+
+    Returns one ranked list per job, each identical to
+    score_candidates_batch(candidates, job, top_k=top_k, matcher=matcher). Each job's location
+    comes from the job itself (JobProfile.location).
+    """
+    components = component_matrix(candidates, jobs, workers, use_cache, matcher)
+    ranked = []
+    for j in range(components.shape[1]):
+        job_components = components[:, j, :]
+        scores = _round_scores(_weighted_totals(job_components))
+        ranked.append([
+            _scored_entry(candidates[i], job_components[i], float(scores[i]))
+            for i in _top_k_order(scores, top_k)
+        ])
+    return ranked
@@ -1,111 +1,384 @@
+import asyncio
+import hashlib
 import os
-import requests
+import httpx
 import re
+import sys
 import time
-import pickle
-from datetime import datetime, timedelta
-from typing import List, Dict
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Iterable, List, Dict, Optional
 from urllib.parse import quote
 from dotenv import load_dotenv
 
+from . import metrics
+from .cache_store import CacheStore
+from .records import CandidateRecord
+from .single_flight import SingleFlight
+
 # Load environment variables
 load_dotenv()
 
 # Constants
+SERPER_URL = "https://google.serper.dev/search"
+SERPER_TIMEOUT = 30
+SERPER_MAX_CONNECTIONS = 20
 MAX_RETRIES = 3
 REQUEST_DELAY = 2
-CACHE_FILE = "cache.pkl"
+CACHE_DB = os.getenv("CACHE_DB", "cache.db")
+CACHE_FILE = "cache.pkl"  # Legacy pickle cache, migrated into CACHE_DB on first use
 CACHE_EXPIRY_DAYS = 7
+QUERY_CACHE_EXPIRY_HOURS = float(os.getenv("QUERY_CACHE_EXPIRY_HOURS", "24"))
+MEMORY_CACHE_MAX_ENTRIES = int(os.getenv("MEMORY_CACHE_MAX_ENTRIES", "50000"))
+MEMORY_CACHE_MAX_BYTES = int(os.getenv("MEMORY_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# "online" always queries Serper, "local_first" only when the local index finds fewer than
+# LOCAL_SEARCH_MIN_RESULTS cached profiles, "offline" never
+SEARCH_MODES = ("online", "local_first", "offline")
+SEARCH_MODE = os.getenv("SEARCH_MODE", "online")
+LOCAL_SEARCH_LIMIT = int(os.getenv("LOCAL_SEARCH_LIMIT", "20"))
+LOCAL_SEARCH_MIN_RESULTS = int(os.getenv("LOCAL_SEARCH_MIN_RESULTS", "10"))
 
-def load_cache() -> Dict[str, Dict]:
-    """Load cached profiles from file."""
-    try:
-        with open(CACHE_FILE, "rb") as f:
-            print("Loading from cache")
-            return pickle.load(f)
-    except (FileNotFoundError, pickle.PickleError):
-        return {}
-
-def save_cache(cache: Dict[str, Dict]):
-    """Save profiles to cache file."""
-    try:
-        with open(CACHE_FILE, "wb") as f:
-            pickle.dump(cache, f)
-    except Exception as e:
-        print(f"Cache save error: {str(e)}")
+_store = None
+_store_lock = threading.Lock()
+_profile_cache = None
+_async_clients = weakref.WeakKeyDictionary()  # event loop -> httpx.AsyncClient
+_sync_loop = None
+_sync_loop_lock = threading.Lock()
+_search_flights = SingleFlight("serper_search")
 
-def is_cache_valid(entry: Dict) -> bool:
-    """Check if cached entry is still valid (not expired)."""
-    timestamp = entry.get("timestamp")
-    if not timestamp:
-        return False
-    return datetime.now() >= timestamp and (datetime.now() - timestamp).days < CACHE_EXPIRY_DAYS
 
-def search_linkedin(job_description: str) -> List[Dict[str, str]]:
+class ProfileCache:
     """
-    Search LinkedIn profiles using Serper.dev
+    Bounded in-memory LRU cache of profiles in front of the persistent store.
+
+    Lookups are served from memory when possible and fall through to the store
+    on a miss; writes go through to the store. Entries expire CACHE_EXPIRY_DAYS
+    after they were first stored, same as in the database. Shared by all requests
+    of the process, so it is guarded by a lock.
+    """
+
+    def __init__(self, store: CacheStore, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.store = store
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # linkedin_url -> (profile, timestamp, size)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _entry_size(profile: Dict) -> int:
+        """Approximate memory footprint of a cached profile."""
+        return sys.getsizeof(profile) + sum(sys.getsizeof(v) for v in profile.values())
+
+    def _insert(self, linkedin_url: str, profile: Dict, timestamp: float):
+        self._remove(linkedin_url)
+        size = self._entry_size(profile)
+        self._entries[linkedin_url] = (profile, timestamp, size)
+        self.bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def _remove(self, linkedin_url: str):
+        entry = self._entries.pop(linkedin_url, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+
+    @metrics.timed("cache_load")
+    def get_many(self, linkedin_urls: Iterable[str]) -> Dict[str, Dict]:
+        """Return unexpired profiles for the given URLs, keyed by URL."""
+        found = {}
+        missing = []
+        expired = 0
+        now = time.time()
+        with self._lock:
+            for url in dict.fromkeys(url for url in linkedin_urls if url):
+                entry = self._entries.get(url)
+                if entry is not None and not 0 <= now - entry[1] < self.ttl_seconds:
+                    self._remove(url)
+                    self.expirations += 1
+                    expired += 1
+                    entry = None
+                if entry is None:
+                    missing.append(url)
+                    continue
+                self._entries.move_to_end(url)
+                found[url] = entry[0]
+                self.hits += 1
+            self.misses += len(missing)
+        metrics.cache_result("profile_memory", hits=len(found), misses=len(missing) - expired, expired=expired)
+
+        if missing:
+            loaded = self.store.get_entries(missing)
+            metrics.cache_result("profile_store", hits=len(loaded), misses=len(missing) - len(loaded))
+            with self._lock:
+                for url, (profile, timestamp) in loaded.items():
+                    self._insert(url, profile, timestamp)
+                    found[url] = profile
+        return found
+
+    @metrics.timed("cache_save")
+    def put_many(self, profiles: List[Dict]):
+        """Write profiles through to the store and keep them in memory as CandidateRecords."""
+        profiles = [CandidateRecord.from_dict(profile) for profile in profiles]
+        timestamp = time.time()
+        self.store.upsert_profiles(profiles, timestamp)
+        with self._lock:
+            for profile in profiles:
+                if profile.get("linkedin_url"):
+                    self._insert(profile["linkedin_url"], profile, timestamp)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring cache effectiveness."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+def get_cache_store() -> CacheStore:
+    """Open the profile store once per process, migrating the legacy pickle cache."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            store = CacheStore(CACHE_DB, CACHE_EXPIRY_DAYS * 24 * 3600, QUERY_CACHE_EXPIRY_HOURS * 3600)
+            if os.path.exists(CACHE_FILE):
+                migrated = store.migrate_from_pickle(CACHE_FILE)
+                print(f"Migrated {migrated} profiles from {CACHE_FILE} to {CACHE_DB}")
+            store.purge_expired()
+            _store = store
+        return _store
+
+def get_profile_cache() -> ProfileCache:
+    """Process-wide in-memory profile cache, shared across API requests."""
+    global _profile_cache
+    store = get_cache_store()
+    with _store_lock:
+        if _profile_cache is None:
+            _profile_cache = ProfileCache(
+                store,
+                MEMORY_CACHE_MAX_ENTRIES,
+                MEMORY_CACHE_MAX_BYTES,
+                CACHE_EXPIRY_DAYS * 24 * 3600
+            )
+        return _profile_cache
+
+@metrics.timed("local_search")
+def search_local(query: str, limit: int = LOCAL_SEARCH_LIMIT) -> List[Dict[str, str]]:
+    """Search the full-text index of cached profiles, best match first, without any API call"""
+    return get_cache_store().search_profiles(query, limit)
+
+async def async_search_linkedin(job_description: str, mode: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    Search LinkedIn profiles using Serper.dev without blocking the event loop
 
     Args:
         job_description: Job description to search candidates for
+        mode: "online", "local_first" or "offline" (defaults to SEARCH_MODE).
+            local_first answers from the local profile index when it finds at
+            least LOCAL_SEARCH_MIN_RESULTS profiles, and otherwise adds the local
+            matches after the Serper results; offline only uses the local index.
 
     Returns:
         List of candidate profiles with name, URL, headline, current company, and location
     """
+    mode = SEARCH_MODE if mode is None else mode
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode {mode!r}, expected one of {SEARCH_MODES}")
+
+    local = []
+    if mode != "online":
+        local = await asyncio.to_thread(search_local, job_description)
+        if mode == "offline" or len(local) >= LOCAL_SEARCH_MIN_RESULTS:
+            metrics.cache_result("local_index", hits=1)
+            return local
+        metrics.cache_result("local_index", misses=1)
+
     try:
-        candidates = search_with_serper(job_description)
-        return candidates
+        candidates = await async_search_with_serper(job_description)
     except Exception as e:
         print(f"Search error: {str(e)}")
-        return []
+        return local
+
+    seen = {candidate.get("linkedin_url") for candidate in candidates}
+    return candidates + [profile for profile in local if profile.get("linkedin_url") not in seen]
+
+def search_linkedin(job_description: str, mode: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    Search LinkedIn profiles using Serper.dev
+
+    Synchronous wrapper around async_search_linkedin for scripts such as main.py.
+
+    Args:
+        job_description: Job description to search candidates for
+        mode: "online", "local_first" or "offline" (defaults to SEARCH_MODE)
 
-def search_with_serper(query: str) -> List[Dict[str, str]]:
-    """Search using Serper.dev API"""
-    cache = load_cache()
+    Returns:
+        List of candidate profiles with name, URL, headline, current company, and location
+    """
+    return _run_sync(async_search_linkedin(job_description, mode))
+
+def serper_query(query: str) -> str:
+    """Build the Serper search string; the query is sent as given."""
+    return f'site:linkedin.com/in {query}'
+
+def query_fingerprint(query: str, page: int = 1) -> str:
+    """
+    Stable cache key for a search query and result page.
+
+    Case and whitespace are normalized, except for the OR operator, which
+    only means OR to Google in upper case.
+    """
+    terms = " ".join(term if term == "OR" else term.lower() for term in query.split())
+    return hashlib.md5(f"site:linkedin.com/in {terms}|{page}".encode()).hexdigest()
+
+def _new_async_client() -> httpx.AsyncClient:
+    """HTTP client with a keep-alive connection pool for Serper requests."""
+    return httpx.AsyncClient(
+        timeout=SERPER_TIMEOUT,
+        limits=httpx.Limits(max_connections=SERPER_MAX_CONNECTIONS, max_keepalive_connections=SERPER_MAX_CONNECTIONS)
+    )
+
+def _get_async_client() -> httpx.AsyncClient:
+    """
+    Return the pooled client for the running event loop.
+
+    Connections are bound to the loop that opened them, so each loop (the uvicorn
+    loop, or the background loop behind search_linkedin) gets its own client.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _new_async_client()
+        _async_clients[loop] = client
+    return client
+
+def _run_sync(coroutine):
+    """
+    Run a coroutine for a synchronous caller on a shared background event loop.
+
+    The loop lives as long as the process, so its pooled client keeps Serper
+    connections alive across calls, and callers that are themselves inside a
+    running event loop (where asyncio.run refuses to start) just wait for the result.
+    """
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, name="serper-sync", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coroutine, _sync_loop).result()
+
+def _cached_search(cache: ProfileCache, fingerprint: str) -> Optional[List[Dict[str, str]]]:
+    """Answer a repeated query entirely from local data when every profile is still cached."""
+    cached_urls = cache.store.get_query(fingerprint)
+    if cached_urls is None:
+        metrics.cache_result("query", misses=1)
+        return None
+    metrics.cache_result("query", hits=1)
+    cached = cache.get_many(cached_urls)
+    if not all(url in cached for url in cached_urls):
+        return None
+    return [cached[url] for url in cached_urls]
+
+def _collect_profiles(cache: ProfileCache, results: List[Dict], fingerprint: str) -> List[Dict[str, str]]:
+    """Turn Serper organic results into profiles, reusing cached ones and storing the rest."""
     candidates = []
+    # Point lookups for just the returned profiles
+    cached = cache.get_many(result.get("link", "") for result in results)
+    new_profiles = []
+
+    for result in results:
+        linkedin_url = result.get("link", "")
+        # Without a profile URL a result can be neither cached nor contacted
+        if not linkedin_url:
+            continue
+        # Check cache first
+        if linkedin_url in cached:
+            print(f"Using cached profile for {linkedin_url}")
+            candidates.append(cached[linkedin_url])
+        else:
+            name, headline = parse_linkedin_title(result.get("title", ""))
+            profile = CandidateRecord(
+                name=name,
+                linkedin_url=linkedin_url,
+                headline=headline,
+                current_company=headline.split(" at ")[-1] if " at " in headline else "",
+                location=""
+            )
+            candidates.append(profile)
+            new_profiles.append(profile)
+    
+    # Only the new profiles are written
+    cache.put_many(new_profiles)
+    # An empty result may be a transient Serper hiccup, so it is not remembered for the whole TTL
+    if candidates:
+        cache.store.put_query(fingerprint, [profile["linkedin_url"] for profile in candidates])
+    return candidates
+
+@metrics.timed("search")
+async def async_search_with_serper(query: str, page: int = 1) -> List[Dict[str, str]]:
+    """
+    Search using Serper.dev API over a pooled async HTTP client.
+
+    Concurrent searches for the same normalized query and page share one
+    in-flight call (and its error), so only one of them calls Serper and writes the cache.
+    """
+    fingerprint = query_fingerprint(query, page)
+    return list(await _search_flights.call_async(fingerprint, _search_with_serper, query, page, fingerprint))
+
+async def _search_with_serper(query: str, page: int, fingerprint: str) -> List[Dict[str, str]]:
+    cache = get_profile_cache()
+
+    # Cache reads and writes hit SQLite, so keep them off the event loop
+    cached = await asyncio.to_thread(_cached_search, cache, fingerprint)
+    if cached is not None:
+        print(f"Using cached search results for {query}")
+        return cached
     
-    url = "https://google.serper.dev/search"
     headers = {
-        "X-API-KEY": os.getenv("SERPER_API_KEY"),
+        "X-API-KEY": os.getenv("SERPER_API_KEY", ""),
         "Content-Type": "application/json"
     }
     payload = {
-        "q": f'site:linkedin.com/in {query}'
+        "q": serper_query(query)
     }
+    if page > 1:
+        payload["page"] = page
 
+    client = _get_async_client()
     for attempt in range(MAX_RETRIES):
         try:
-            response = requests.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
-
-            for result in data.get("organic", []):
-                linkedin_url = result.get("link", "")
-                # Check cache first
-                if linkedin_url in cache and is_cache_valid(cache[linkedin_url]):
-                    print(f"Using cached profile for {linkedin_url}")
-                    candidates.append(cache[linkedin_url]["profile"])
-                else:
-                    name, headline = parse_linkedin_title(result.get("title", ""))
-                    profile = {
-                        "name": name,
-                        "linkedin_url": linkedin_url,
-                        "headline": headline,
-                        "current_company": headline.split(" at ")[-1] if " at " in headline else "",
-                        "location": ""
-                    }
-                    candidates.append(profile)
-                    cache[linkedin_url] = {"profile": profile, "timestamp": datetime.now()}
-            
-            save_cache(cache)
-            return candidates
-        except requests.exceptions.RequestException as e:
+            with metrics.span("serper_request"):
+                response = await client.post(SERPER_URL, headers=headers, json=payload)
+                response.raise_for_status()
+                data = response.json()
+            metrics.external_call("serper", "ok")
+            return await asyncio.to_thread(_collect_profiles, cache, data.get("organic", []), fingerprint)
+        except httpx.HTTPError as e:
             print(f"Serper attempt {attempt + 1} failed: {str(e)}")
             if attempt == MAX_RETRIES - 1:
+                metrics.external_call("serper", "error")
                 raise
-            time.sleep(REQUEST_DELAY * (attempt + 1))
+            metrics.external_call("serper", "retry")
+            await asyncio.sleep(REQUEST_DELAY * (attempt + 1))
     
-    save_cache(cache)
-    return candidates
+    return []
+
+def search_with_serper(query: str, page: int = 1) -> List[Dict[str, str]]:
+    """Search using Serper.dev API (synchronous wrapper around async_search_with_serper)"""
+    return _run_sync(async_search_with_serper(query, page))
 
 def parse_linkedin_title(title: str) -> tuple[str, str]:
     """Extract name and headline from LinkedIn title"""
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, Tuple
+
+from . import metrics
+
+
+class _Abandoned(Exception):
+    """Set on a shared call whose leader was cancelled or interrupted before it finished."""
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key.
+
+    The first caller for a key (the leader) runs the function; callers that ask
+    for the same key while it runs wait for the leader's result, or get its
+    exception. Only ordinary exceptions are shared: if the leader is cancelled
+    (e.g. its client disconnected) the waiting callers start over and one of
+    them takes the lead. Nothing is kept once the call finishes, so this never
+    serves stale data. Works across threads (call) and event loops (call_async), since the
+    shared state is a concurrent.futures.Future.
+    """
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """The in-flight future for key, and whether the caller is its leader."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = self._calls[key] = Future()
+        # A running future can't be cancelled, so one follower giving up never cancels it for the others
+        future.set_running_or_notify_cancel()
+        return future, True
+
+    def _finish(self, key: Hashable, future: Future, result=None, error: BaseException = None):
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def call(self, key: Hashable, func: Callable, *args, **kwargs):
+        """func(*args, **kwargs), shared with any concurrent call for the same key."""
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            metrics.inc("coalesced_requests_total", operation=self.operation)
+            try:
+                return future.result()
+            except _Abandoned:
+                continue
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self._finish(key, future, error=e)
+            raise
+        except BaseException:
+            self._finish(key, future, error=_Abandoned())
+            raise
+        self._finish(key, future, result)
+        return result
+
+    async def call_async(self, key: Hashable, func: Callable, *args, **kwargs):
+        """await func(*args, **kwargs), shared with any concurrent call for the same key."""
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            metrics.inc("coalesced_requests_total", operation=self.operation)
+            try:
+                return await asyncio.wrap_future(future)
+            except _Abandoned:
+                continue
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as e:
+            self._finish(key, future, error=e)
+            raise
+        except BaseException:
+            # Cancelled: the followers' requests are still live, so they retry instead of failing with it
+            self._finish(key, future, error=_Abandoned())
+            raise
+        self._finish(key, future, result)
+        return result
+
+    def in_flight(self) -> int:
+        """Number of keys currently being computed."""
+        with self._lock:
+            return len(self._calls)
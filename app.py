@@ -1,11 +1,21 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+import asyncio
 import logging
-from agent.search_linkedin import search_linkedin
-from agent.score_candidates import score_candidates
-from agent.generate_outreach import generate_outreach
+import threading
+from agent.search_linkedin import async_search_linkedin, get_cache_store, query_fingerprint
+from agent.score_candidates import score_candidates_batch, score_candidates_multi
+from agent.generate_outreach import generate_outreach, iter_outreach
+from agent.job_profile import JobProfile
+from agent.job_input import preprocess_job_description
+from agent.run_queue import RunQueue
+from agent import metrics
 import os
 import json
+from collections.abc import Mapping
+from typing import List, Optional
 
 # Configure environment
 os.environ['WDM_LOCAL'] = '1'
@@ -13,55 +23,216 @@ os.environ['WDM_CACHE_PATH'] = '/tmp/.wdm'
 
 app = FastAPI(title="Synapse Recruitment API")
 
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    """Report the time spent in each pipeline stage of a request in a Server-Timing header"""
+    if not metrics.METRICS_ENABLED:
+        return await call_next(request)
+    token = metrics.start_request()
+    try:
+        response = await call_next(request)
+    finally:
+        timing = metrics.end_request(token)
+    if timing:
+        response.headers["Server-Timing"] = timing
+    return response
+
+@app.get("/metrics")
+def get_metrics():
+    """Stage latencies, cache hit rates and external API calls in Prometheus text format"""
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 class JobRequest(BaseModel):
     description: str
     location: str = ""
-    max_candidates: int = 10  # Update to 10 as per requirement
+    max_candidates: int = Field(10, ge=1)  # Update to 10 as per requirement
+    search_mode: Optional[str] = None  # "online", "local_first" or "offline"; defaults to SEARCH_MODE
+
+class BatchJobRequest(BaseModel):
+    jobs: List[JobRequest]
+    generate_messages: bool = False  # Outreach for every job's top candidates shares the Gemini quota
+
+class SourcingRunRequest(JobRequest):
+    description: str = ""
+    job_url: Optional[str] = None  # Job page fetched first; its text is used when description is empty
 
 def safe_get(d, keys, default=""):
-    """Safely get nested dictionary values"""
+    """Safely get nested dictionary (or candidate record) values"""
     for key in keys:
-        if isinstance(d, dict):
+        if isinstance(d, Mapping):
             d = d.get(key, default)
         else:
             return default
     return d
 
+def candidate_result(candidate, outreach_msg=None):
+    """Shape a scored candidate for API responses"""
+    result = {
+        "name": safe_get(candidate, ["name"]),
+        "linkedin_url": safe_get(candidate, ["linkedin_url"]),
+        "score": safe_get(candidate, ["score"], 0)
+    }
+    if outreach_msg is not None:
+        result["outreach_message"] = outreach_msg
+    result["match_analysis"] = [
+        f"Experience: {safe_get(candidate, ['breakdown', 'experience_match'], 0)}/10",
+        f"Education: {safe_get(candidate, ['breakdown', 'education'], 0)}/10"
+    ]
+    return result
+
+async def source_candidates(request: JobRequest) -> dict:
+    """Search, score and write outreach for one job; the /get_candidates/ response body"""
+    candidates = await async_search_linkedin(request.description, request.search_mode)
+    if not candidates:
+        return {
+            "job_description": request.description,
+            "warning": "No candidates found",
+            "top_candidates": []
+        }
+
+    # Job-side features are computed once and shared by scoring and outreach.
+    # The location is only echoed back, it does not affect ranking.
+    job = JobProfile(request.description)
+
+    # Only the top max_candidates are kept, so select them without a full sort. Scoring may
+    # read and write the feature cache (FEATURE_CACHE), so it runs off the event loop.
+    scored = await asyncio.to_thread(score_candidates_batch, candidates, job, top_k=request.max_candidates)
+    if scored:
+        logging.debug("Scored candidate: %s", scored[0])
+    # Gemini calls block, so run them off the event loop
+    outreach_msgs = await asyncio.to_thread(generate_outreach, scored, job)  # Returns list of dicts
+    
+    messages = []
+    # generate_outreach keeps candidate order, so messages pair up by position
+    for candidate, msg_dict in zip(scored, outreach_msgs):
+        outreach_msg = safe_get(msg_dict, ["message"], "Unable to generate message")
+        messages.append(candidate_result(candidate, outreach_msg))
+    
+    return {
+        "job_description": request.description,
+        "location": request.location,
+        "top_candidates": messages
+    }
+
 @app.post("/get_candidates/")
 async def get_candidates(request: JobRequest):
     try:
-        candidates = search_linkedin(request.description)
-        if not candidates:
-            return {
-                "job_description": request.description,
-                "warning": "No candidates found",
-                "top_candidates": []
-            }
-
-        scored = score_candidates(candidates, request.description)
-        print(f"Scored candidate: {scored[0]}")  # Debug to check data
-        outreach_msgs = generate_outreach(scored, request.description)  # Returns list of dicts
-        
-        messages = []
-        for i, candidate in enumerate(scored[:request.max_candidates]):
-            # Find the corresponding outreach message for this candidate
-            msg_dict = next((m for m in outreach_msgs if m.get("candidate") == safe_get(candidate, ["name"])), {})
-            outreach_msg = safe_get(msg_dict, ["message"], "Unable to generate message")
-            messages.append({
-                "name": safe_get(candidate, ["name"]),
-                "linkedin_url": safe_get(candidate, ["linkedin_url"]),
-                "score": safe_get(candidate, ["score"], 0),
-                "outreach_message": outreach_msg,
-                "match_analysis": [
-                    f"Experience: {safe_get(candidate, ['breakdown', 'experience_match'], 0)}/10",
-                    f"Education: {safe_get(candidate, ['breakdown', 'education'], 0)}/10"
+        return await source_candidates(request)
+
+    except Exception as e:
+        logging.error(f"API Error: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=400,
+            detail=f"Processing failed: {str(e)}"
+        )
+
+def _format_event(event: dict, sse: bool) -> str:
+    """Encode one stream event as an NDJSON line or a Server-Sent Event"""
+    data = json.dumps(event)
+    if sse:
+        return f"event: {event['type']}\ndata: {data}\n\n"
+    return data + "\n"
+
+@app.post("/get_candidates/stream")
+async def stream_candidates(request: JobRequest, http_request: Request):
+    """
+    Streaming variant of /get_candidates/.
+
+    Emits the ranked candidates as soon as scoring finishes, then one "outreach"
+    event per message as it completes, keyed by linkedin_url. Responds with
+    Server-Sent Events when the client accepts text/event-stream, NDJSON otherwise.
+    """
+    try:
+        candidates = await async_search_linkedin(request.description, request.search_mode)
+        job = JobProfile(request.description)
+        scored = await asyncio.to_thread(score_candidates_batch, candidates, job, top_k=request.max_candidates)
+    except Exception as e:
+        logging.error(f"API Error: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=400,
+            detail=f"Processing failed: {str(e)}"
+        )
+
+    sse = "text/event-stream" in http_request.headers.get("accept", "")
+
+    def events():
+        yield _format_event({
+            "type": "job",
+            "job_description": request.description,
+            "location": request.location,
+            "total": len(scored)
+        }, sse)
+        for rank, candidate in enumerate(scored, start=1):
+            yield _format_event({"type": "candidate", "rank": rank, **candidate_result(candidate)}, sse)
+        # Runs in Starlette's threadpool, so the blocking Gemini calls stay off the event loop
+        for index, msg_dict in iter_outreach(scored, job):
+            yield _format_event({
+                "type": "outreach",
+                "rank": index + 1,
+                "linkedin_url": safe_get(scored[index], ["linkedin_url"]),
+                "outreach_message": safe_get(msg_dict, ["message"], "Unable to generate message")
+            }, sse)
+        yield _format_event({"type": "done"}, sse)
+
+    media_type = "text/event-stream" if sse else "application/x-ndjson"
+    return StreamingResponse(events(), media_type=media_type)
+
+@app.post("/get_candidates/batch")
+async def get_candidates_batch(request: BatchJobRequest):
+    """
+    Rank one shared candidate pool against several jobs.
+
+    Identical searches are run once, candidates from all searches are merged by
+    linkedin_url, and the pool is scored against every job in a single pass
+    (job-independent features are extracted once). Returns each job's top
+    max_candidates, with outreach messages when generate_messages is set.
+    """
+    try:
+        # One search per distinct query, all in flight at once
+        queries = {}
+        for job_request in request.jobs:
+            key = (query_fingerprint(job_request.description), job_request.search_mode)
+            queries.setdefault(key, job_request)
+        found = await asyncio.gather(*(
+            async_search_linkedin(job_request.description, job_request.search_mode) for job_request in queries.values()
+        ))
+
+        pool = {}
+        for candidates in found:
+            for candidate in candidates:
+                pool.setdefault(candidate.get("linkedin_url") or candidate.get("name"), candidate)
+        candidates = list(pool.values())
+
+        jobs = [JobProfile(job_request.description) for job_request in request.jobs]
+        top_k = max((job_request.max_candidates for job_request in request.jobs), default=0)
+        ranked = await asyncio.to_thread(score_candidates_multi, candidates, jobs, top_k=top_k)
+        ranked = [scored[:job_request.max_candidates] for scored, job_request in zip(ranked, request.jobs)]
+
+        outreach = [None] * len(jobs)
+        if request.generate_messages:
+            outreach = await asyncio.gather(*(
+                asyncio.to_thread(generate_outreach, scored, job) for scored, job in zip(ranked, jobs)
+            ))
+
+        results = []
+        for job_request, scored, messages in zip(request.jobs, ranked, outreach):
+            if messages is None:
+                top_candidates = [candidate_result(candidate) for candidate in scored]
+            else:
+                top_candidates = [
+                    candidate_result(candidate, safe_get(msg_dict, ["message"], "Unable to generate message"))
+                    for candidate, msg_dict in zip(scored, messages)
                 ]
+            results.append({
+                "job_description": job_request.description,
+                "location": job_request.location,
+                "top_candidates": top_candidates
             })
-        
+
         return {
-            "job_description": request.description,
-            "location": request.location,
-            "top_candidates": messages
+            "searches": len(queries),
+            "candidate_pool": len(candidates),
+            "jobs": results
         }
 
     except Exception as e:
@@ -69,4 +240,79 @@ async def get_candidates(request: JobRequest):
         raise HTTPException(
             status_code=400,
             detail=f"Processing failed: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+async def _sourcing_run(request: SourcingRunRequest) -> dict:
+    """A full sourcing run: the job page when job_url is given, then the /get_candidates/ pipeline"""
+    description, location = request.description, request.location
+    if request.job_url:
+        job = await asyncio.to_thread(preprocess_job_description, request.job_url)
+        if job.get("error"):
+            raise RuntimeError(f"Could not fetch job page: {job['error']}")
+        description = description or JobProfile.from_job(job).description
+        location = location or job.get("location") or ""
+    return await source_candidates(JobRequest(
+        description=description,
+        location=location,
+        max_candidates=request.max_candidates,
+        search_mode=request.search_mode
+    ))
+
+_run_loops = threading.local()
+
+def _execute_run(payload: dict) -> dict:
+    """
+    Run queue entry point. Each worker thread keeps one event loop for all its
+    runs, so the pooled Serper client of that loop is reused instead of leaked per run.
+    """
+    loop = getattr(_run_loops, "loop", None)
+    if loop is None:
+        loop = _run_loops.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(_sourcing_run(SourcingRunRequest(**payload)))
+
+_run_queue = None
+_run_queue_lock = threading.Lock()
+
+def get_run_queue() -> RunQueue:
+    """The process's sourcing run queue, created on first use"""
+    global _run_queue
+    with _run_queue_lock:
+        if _run_queue is None:
+            queue = RunQueue(get_cache_store(), _execute_run)
+            # Runs whose worker process died (e.g. a restart) would otherwise stay "running" until
+            # another queue's heartbeat notices them
+            recovered = queue.recover()
+            if recovered:
+                print(f"Marked {recovered} interrupted sourcing runs as failed")
+            _run_queue = queue
+        return _run_queue
+
+@app.post("/get_candidates/runs", status_code=202)
+async def submit_run(request: SourcingRunRequest):
+    """
+    Queue a full sourcing run and return its id at once.
+
+    A bounded worker pool (RUN_WORKERS) works through queued runs; poll
+    GET /get_candidates/runs/{run_id} for the status and result. Responds 429
+    when RUN_QUEUE_MAX runs are already queued or running in this worker.
+    """
+    if not request.description and not request.job_url:
+        raise HTTPException(status_code=422, detail="Either description or job_url is required")
+    queue = await asyncio.to_thread(get_run_queue)
+    run_id = await asyncio.to_thread(queue.submit, jsonable_encoder(request))
+    if run_id is None:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Sourcing queue is full ({queue.max_pending} runs pending), retry later",
+            headers={"Retry-After": "30"}
+        )
+    return {"run_id": run_id, "status": "queued", "status_url": f"/get_candidates/runs/{run_id}"}
+
+@app.get("/get_candidates/runs/{run_id}")
+async def get_run(run_id: str):
+    """Status of a sourcing run ("queued", "running", "succeeded" or "failed") with its result or error"""
+    queue = await asyncio.to_thread(get_run_queue)
+    run = await asyncio.to_thread(queue.get, run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Unknown run {run_id}")
+    return run
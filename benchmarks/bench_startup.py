@@ -0,0 +1,74 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules timed in a fresh interpreter each run
+TARGETS = ["agent", "agent.job_input", "agent.score_candidates", "agent.search_linkedin", "app"]
+
+# Dependencies that should only load when the code that needs them runs
+HEAVY_MODULES = ["selenium", "webdriver_manager", "bs4", "lxml", "numpy", "scipy", "httpx", "requests", "fastapi"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {target}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def time_import(target: str) -> dict:
+    """Import a module in a clean interpreter and report the time taken and the heavy modules it loaded."""
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(target=target, heavy=HEAVY_MODULES)],
+        cwd=ROOT, capture_output=True, text=True, timeout=120
+    )
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr else "failed"}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def bench(targets, repeat: int) -> dict:
+    results = {}
+    for target in targets:
+        runs = [time_import(target) for _ in range(repeat)]
+        errors = [run["error"] for run in runs if "error" in run]
+        if errors:
+            results[target] = {"error": errors[0]}
+            continue
+        seconds = [run["seconds"] for run in runs]
+        results[target] = {
+            "median_ms": round(statistics.median(seconds) * 1000, 1),
+            "min_ms": round(min(seconds) * 1000, 1),
+            "loaded": runs[-1]["loaded"],
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import time of the agent package and the API.")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per target")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("targets", nargs="*", default=TARGETS)
+    args = parser.parse_args()
+
+    results = bench(args.targets, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for target, result in results.items():
+        if "error" in result:
+            print(f"{target:<26} error: {result['error']}")
+        else:
+            loaded = ", ".join(result["loaded"]) or "-"
+            print(f"{target:<26} {result['median_ms']:>8.1f} ms (min {result['min_ms']:.1f})  loads: {loaded}")
+
+
+if __name__ == "__main__":
+    main()
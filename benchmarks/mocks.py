@@ -0,0 +1,104 @@
+import copy
+import json
+import os
+import re
+from typing import Dict, Optional
+
+import httpx
+import requests
+from requests.structures import CaseInsensitiveDict
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def load_json_fixture(name: str) -> Dict:
+    return json.loads(load_fixture(name))
+
+
+def make_response(status_code: int, body: str = "", headers: Optional[Dict] = None) -> requests.Response:
+    """A real requests.Response carrying a canned body, so raise_for_status() and json() behave as usual."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body.encode("utf-8")
+    response.encoding = "utf-8"
+    response.headers = CaseInsensitiveDict(headers or {})
+    return response
+
+
+def serper_transport(organic=None) -> httpx.MockTransport:
+    """Answers every Serper search with the recorded fixture (or the given organic results)."""
+    recorded = load_json_fixture("serper_search.json")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        data = dict(recorded, searchParameters={**recorded["searchParameters"], "q": payload["q"]})
+        if organic is not None:
+            data["organic"] = organic
+        return httpx.Response(200, json=data)
+
+    return httpx.MockTransport(handler)
+
+
+def install_serper(search_linkedin_module, organic=None):
+    """Route search_linkedin's pooled Serper client through the fixture transport."""
+    transport = serper_transport(organic)
+    search_linkedin_module._new_async_client = lambda: httpx.AsyncClient(transport=transport)
+    search_linkedin_module._async_clients.clear()
+
+
+class GeminiSession:
+    """Stands in for generate_outreach._session, replaying the recorded Gemini responses."""
+
+    def __init__(self):
+        self.single = load_json_fixture("gemini_generate.json")
+        self.batch = load_json_fixture("gemini_batch.json")
+        self.calls = 0
+
+    def post(self, url, **kwargs):
+        self.calls += 1
+        payload = kwargs.get("json") or {}
+        if payload.get("generationConfig", {}).get("responseMimeType") != "application/json":
+            return make_response(200, json.dumps(self.single))
+
+        # Answer a batch prompt with one recorded message per numbered candidate
+        prompt = payload["contents"][0]["parts"][0]["text"]
+        count = len(re.findall(r"^\d+\. Name:", prompt, re.MULTILINE))
+        template = json.loads(self.batch["candidates"][0]["content"]["parts"][0]["text"])
+        entries = [
+            {"candidate": number, "message": template[(number - 1) % len(template)]["message"]}
+            for number in range(1, count + 1)
+        ]
+        data = copy.deepcopy(self.batch)
+        data["candidates"][0]["content"]["parts"][0]["text"] = json.dumps(entries)
+        return make_response(200, json.dumps(data))
+
+
+class JobPageSession:
+    """Stands in for job_input._session: serves a fixture page with an ETag and honours If-None-Match."""
+
+    def __init__(self, fixture: str = "job_page.html"):
+        self.html = load_fixture(fixture)
+        self.etag = '"fixture-v1"'
+        self.calls = 0
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        self.calls += 1
+        if headers and headers.get("If-None-Match") == self.etag:
+            return make_response(304, headers={"ETag": self.etag})
+        return make_response(200, self.html, {"ETag": self.etag, "Content-Type": "text/html; charset=utf-8"})
+
+
+class FixtureBrowserPool:
+    """Stands in for the Selenium pool, returning the rendered fixture page."""
+
+    def __init__(self, fixture: str = "job_page.html"):
+        self.html = load_fixture(fixture)
+
+    def fetch(self, url: str, timeout: float = 0, min_text_length: int = 1) -> str:
+        return self.html
+
@@ -0,0 +1,330 @@
+import argparse
+import asyncio
+import contextlib
+import importlib
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks import mocks, synthetic  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+DEFAULT_THRESHOLD = 0.20  # Flag stages more than 20% slower (or heavier) than the baseline
+
+# Fixed workload sizes for stages whose cost does not grow with the candidate pool
+SEARCH_QUERIES = 20
+JOB_PAGES = 20
+OUTREACH_CANDIDATES = 50
+OUTREACH_BATCH_SIZE = 10
+
+_unique = itertools.count()
+
+
+def _isolate(workdir: str):
+    """Point every cache at a scratch directory and make sure nothing can reach the network."""
+    os.environ["CACHE_DB"] = os.path.join(workdir, "cache.db")
+    os.environ["SERPER_API_KEY"] = "benchmark"
+    os.environ["GEMINI_API_KEY"] = "benchmark"
+    os.environ["GEMINI_CALLS_PER_MINUTE"] = "1000000"  # The fixtures answer instantly
+    os.chdir(workdir)  # The legacy cache.pkl path is relative
+
+    # import_module, because `from agent import x` returns the function of the same name
+    search_linkedin = importlib.import_module("agent.search_linkedin")
+    generate_outreach = importlib.import_module("agent.generate_outreach")
+    job_input = importlib.import_module("agent.job_input")
+    mocks.install_serper(search_linkedin)
+    generate_outreach._session = mocks.GeminiSession()
+    job_input._session = mocks.JobPageSession()
+    job_input.get_browser_pool = lambda: mocks.FixtureBrowserPool()
+
+
+# Each stage takes the scale n and does its setup untimed, returning
+# (number of items processed, zero-argument callable to time)
+
+def stage_parse_linkedin_title(n):
+    from agent.search_linkedin import parse_linkedin_title
+    titles = synthetic.make_linkedin_titles(n)
+    return n, lambda: [parse_linkedin_title(title) for title in titles]
+
+
+def _job():
+    from agent.job_profile import JobProfile
+    return JobProfile(synthetic.JOB_DESCRIPTION, "San Francisco, CA")
+
+
+def stage_score_candidates(n):
+    from agent.score_candidates import score_candidates
+    candidates, job = synthetic.make_candidates(n), _job()
+    return n, lambda: score_candidates(candidates, job, use_cache=False)
+
+
+def stage_score_candidates_batch(n):
+    from agent.score_candidates import score_candidates_batch
+    candidates, job = synthetic.make_candidates(n), _job()
+    return n, lambda: score_candidates_batch(candidates, job, top_k=50, use_cache=False)
+
+
+def stage_score_candidates_tfidf(n):
+    from agent.experience_matcher import rebuild_vocabulary
+    from agent.score_candidates import score_candidates_batch
+    candidates, job = synthetic.make_candidates(n), _job()
+    rebuild_vocabulary(candidates, [job.text])  # Fits and saves the vocabulary once
+    return n, lambda: score_candidates_batch(candidates, job, top_k=50, use_cache=False, matcher="tfidf")
+
+
+def stage_rescore_cached(n):
+    from agent.score_candidates import score_candidates_batch
+    candidates, job = synthetic.make_candidates(n, seed=next(_unique)), _job()
+    score_candidates_batch(candidates, job, top_k=50, use_cache=True)  # Stores the candidate features
+    return n, lambda: score_candidates_batch(candidates, job, top_k=50, use_cache=True)
+
+
+def _new_store():
+    from agent.cache_store import CacheStore
+    path = os.path.join(os.getcwd(), f"store-{next(_unique)}.db")
+    return CacheStore(path, 7 * 24 * 3600)
+
+
+def stage_cache_save(n):
+    store, candidates = _new_store(), synthetic.make_candidates(n)
+    return n, lambda: store.upsert_profiles(candidates)
+
+
+def stage_cache_load(n):
+    store, candidates = _new_store(), synthetic.make_candidates(n)
+    store.upsert_profiles(candidates)
+    urls = [candidate["linkedin_url"] for candidate in candidates]
+    return n, lambda: store.get_profiles(urls)
+
+
+def stage_memory_cache_get(n):
+    from agent.search_linkedin import ProfileCache
+    store, candidates = _new_store(), synthetic.make_candidates(n)
+    cache = ProfileCache(store, max(n, 1), 1 << 40, 7 * 24 * 3600)
+    cache.put_many(candidates)
+    urls = [candidate["linkedin_url"] for candidate in candidates]
+    return n, lambda: cache.get_many(urls)
+
+
+LOCAL_QUERIES = [
+    "Senior Machine Learning Engineer San Francisco",
+    "Data Engineer Spark Kafka",
+    "Rust Kubernetes Toronto",
+    "Product Manager Stripe Stanford",
+    "Junior Frontend Engineer React TypeScript Remote",
+]
+
+
+def stage_local_search(n):
+    store, candidates = _new_store(), synthetic.make_candidates(n)
+    store.upsert_profiles(candidates)
+    return len(LOCAL_QUERIES), lambda: [store.search_profiles(query, 20) for query in LOCAL_QUERIES]
+
+
+def _run_searches(queries):
+    from agent.search_linkedin import async_search_with_serper
+
+    async def search_all():
+        return await asyncio.gather(*(async_search_with_serper(query) for query in queries))
+
+    return asyncio.run(search_all())
+
+
+def stage_serper_search(n):
+    run = next(_unique)
+    queries = [f"machine learning engineer fintech {run} {i}" for i in range(SEARCH_QUERIES)]
+    return len(queries), lambda: _run_searches(queries)
+
+
+def stage_serper_search_cached(n):
+    run = next(_unique)
+    queries = [f"machine learning engineer fintech {run} {i}" for i in range(SEARCH_QUERIES)]
+    _run_searches(queries)
+    return len(queries), lambda: _run_searches(queries)
+
+
+def stage_parse_job_page(n):
+    from agent.job_input import parse_job_page
+    html = mocks.load_fixture("job_page.html")
+    return JOB_PAGES, lambda: [parse_job_page(f"https://jobs.example.com/{i}", html) for i in range(JOB_PAGES)]
+
+
+def _job_urls():
+    run = next(_unique)
+    return [f"https://jobs.example.com/{run}/{i}" for i in range(JOB_PAGES)]
+
+
+def stage_job_fetch(n):
+    from agent.job_input import preprocess_job_description
+    urls = _job_urls()
+    return len(urls), lambda: [preprocess_job_description(url) for url in urls]
+
+
+def stage_job_fetch_revalidate(n):
+    from agent.job_input import preprocess_job_description
+    urls = _job_urls()
+    for url in urls:
+        preprocess_job_description(url)
+    return len(urls), lambda: [preprocess_job_description(url) for url in urls]
+
+
+def _outreach_stage(batch_size):
+    from agent.generate_outreach import generate_outreach
+    candidates = synthetic.make_candidates(OUTREACH_CANDIDATES, seed=next(_unique))
+    description = f"{synthetic.JOB_DESCRIPTION} Req {next(_unique)}."  # Never served from the message cache
+    return len(candidates), lambda: generate_outreach(candidates, description, batch_size=batch_size)
+
+
+def stage_outreach(n):
+    return _outreach_stage(1)
+
+
+def stage_outreach_batched(n):
+    return _outreach_stage(OUTREACH_BATCH_SIZE)
+
+
+# name -> (setup, whether the workload grows with the scale)
+STAGES = {
+    "parse_linkedin_title": (stage_parse_linkedin_title, True),
+    "score_candidates": (stage_score_candidates, True),
+    "score_candidates_batch": (stage_score_candidates_batch, True),
+    "score_candidates_tfidf": (stage_score_candidates_tfidf, True),
+    "rescore_cached": (stage_rescore_cached, True),
+    "cache_save": (stage_cache_save, True),
+    "cache_load": (stage_cache_load, True),
+    "memory_cache_get": (stage_memory_cache_get, True),
+    "local_search": (stage_local_search, True),
+    "serper_search": (stage_serper_search, False),
+    "serper_search_cached": (stage_serper_search_cached, False),
+    "parse_job_page": (stage_parse_job_page, False),
+    "job_fetch": (stage_job_fetch, False),
+    "job_fetch_revalidate": (stage_job_fetch_revalidate, False),
+    "outreach": (stage_outreach, False),
+    "outreach_batched": (stage_outreach_batched, False),
+}
+
+
+def measure(setup, n: int, repeat: int) -> dict:
+    """Best and median wall time over `repeat` fresh runs, then one traced run for peak memory."""
+    timings = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            items, run = setup(n)
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+
+        # tracemalloc slows allocation-heavy code, so memory gets its own run
+        items, run = setup(n)
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        "items": items,
+        "best_s": round(best, 6),
+        "median_s": round(statistics.median(timings), 6),
+        "items_per_s": round(items / best, 1) if best > 0 else None,
+        "peak_mb": round(peak / (1024 * 1024), 3),
+    }
+
+
+def run_benchmarks(stages, scales, repeat: int) -> dict:
+    results = {}
+    for name in stages:
+        setup, scaled = STAGES[name]
+        for n in (scales if scaled else scales[:1]):
+            key = f"{name}@{n}" if scaled else name
+            results[key] = dict(stage=name, n=n if scaled else None, **measure(setup, n, repeat))
+            result = results[key]
+            print(f"{key:<34} {result['best_s'] * 1000:>10.2f} ms  {result['items_per_s'] or 0:>12,.0f} items/s"
+                  f"  peak {result['peak_mb']:>8.2f} MB", flush=True)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Print each stage against the baseline and return the keys that regressed."""
+    regressions = []
+    print(f"\nCompared with baseline from {baseline.get('meta', {}).get('timestamp', 'unknown')}:")
+    for key, result in results.items():
+        previous = baseline.get("results", {}).get(key)
+        if previous is None:
+            print(f"{key:<34} (no baseline)")
+            continue
+        time_ratio = result["best_s"] / previous["best_s"] if previous["best_s"] else 1.0
+        memory_ratio = result["peak_mb"] / previous["peak_mb"] if previous["peak_mb"] else 1.0
+        regressed = time_ratio > 1 + threshold or memory_ratio > 1 + threshold
+        if regressed:
+            regressions.append(key)
+        print(f"{key:<34} time x{time_ratio:.2f}  memory x{memory_ratio:.2f}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for scoring, caching, search, parsing and outreach.")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1000],
+                        help="candidate pool sizes for the scaled stages, e.g. 1000 100000 1000000")
+    parser.add_argument("--stages", default="all", help="comma-separated stage names (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage; the best is reported")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown or memory growth reported as a regression")
+    args = parser.parse_args()
+
+    stages = list(STAGES) if args.stages == "all" else [name.strip() for name in args.stages.split(",")]
+    unknown = [name for name in stages if name not in STAGES]
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)} (available: {', '.join(STAGES)})")
+
+    output = os.path.abspath(args.output) if args.output else None
+    baseline_path = os.path.abspath(args.baseline)
+
+    with tempfile.TemporaryDirectory(prefix="synapse-bench-") as workdir:
+        _isolate(workdir)
+        results = run_benchmarks(stages, sorted(args.scale), args.repeat)
+        os.chdir(ROOT)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(baseline_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved baseline to {baseline_path}")
+        return
+
+    if os.path.exists(baseline_path):
+        with open(baseline_path) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import random
+from typing import Dict, List
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn",
+               "Priya", "Wei", "Carlos", "Fatima", "Olga", "Kenji", "Amara", "Luca", "Noor", "Diego"]
+LAST_NAMES = ["Smith", "Chen", "Garcia", "Patel", "Kim", "Nguyen", "Johnson", "Muller", "Rossi", "Okafor",
+              "Silva", "Ivanova", "Tanaka", "Haddad", "Brown", "Lopez", "Singh", "Cohen", "Park", "Ali"]
+SENIORITY = ["", "", "Junior ", "Senior ", "Staff ", "Lead ", "Principal ", "Intern "]
+ROLES = ["Software Engineer", "Machine Learning Engineer", "Data Scientist", "Backend Developer",
+         "Frontend Engineer", "DevOps Engineer", "Product Manager", "Research Scientist", "SRE",
+         "Full Stack Developer", "Data Engineer", "Engineering Manager"]
+COMPANIES = ["Google", "Stripe", "Meta", "OpenAI", "Shopify", "IBM", "Acme Corp", "Datadog", "Airbnb",
+             "Accenture", "Infosys", "a Seed-stage Startup", "Microsoft", "Palantir", "Local Bank"]
+SCHOOLS = ["Stanford University", "MIT", "UC Berkeley", "University of Texas", "Georgia Tech",
+           "State College", "IIT Bombay", "University of Toronto", "Coding Bootcamp", ""]
+SKILLS = ["Python", "Go", "Java", "AWS", "Docker", "Kubernetes", "React", "SQL", "PyTorch", "TensorFlow",
+          "Spark", "Kafka", "TypeScript", "Rust", "GCP", "Terraform", "NLP", "LLMs"]
+LOCATIONS = ["San Francisco, CA", "Seattle, WA", "New York, NY", "Austin, TX", "Boston, MA",
+             "Remote", "London, UK", "Toronto, ON", "Bangalore, India", ""]
+TENURES = ["", "", "3 years", "18 months", "5+ years", "2 yrs", "10 years"]
+
+JOB_DESCRIPTION = (
+    "Senior Machine Learning Engineer at Acme Corp in San Francisco is hiring. "
+    "Location: San Francisco, CA. Salary: $180,000-220,000 per year. Full-time. "
+    "5 years experience building production ML systems with Python, PyTorch, AWS, "
+    "Docker and Kubernetes. Experience with LLMs, NLP, SQL and Spark is a plus."
+)
+
+
+def make_headline(rng: random.Random) -> str:
+    """A LinkedIn-style headline such as 'Senior Data Scientist at Stripe | MIT | Python, AWS'."""
+    parts = [f"{rng.choice(SENIORITY)}{rng.choice(ROLES)} at {rng.choice(COMPANIES)}"]
+    school = rng.choice(SCHOOLS)
+    if school:
+        parts.append(school)
+    parts.append(", ".join(rng.sample(SKILLS, rng.randint(1, 5))))
+    tenure = rng.choice(TENURES)
+    if tenure:
+        parts.append(tenure)
+    location = rng.choice(LOCATIONS)
+    if location:
+        parts.append(location)
+    return " | ".join(parts)
+
+
+def make_candidates(n: int, seed: int = 0) -> List[Dict[str, str]]:
+    """n synthetic profiles shaped like search_linkedin results."""
+    rng = random.Random(seed)
+    candidates = []
+    for i in range(n):
+        headline = make_headline(rng)
+        role = headline.split(" | ")[0]
+        candidates.append({
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "linkedin_url": f"https://www.linkedin.com/in/synthetic-{seed}-{i}",
+            "headline": headline,
+            "current_company": role.split(" at ")[-1],
+            "location": rng.choice(LOCATIONS),
+        })
+    return candidates
+
+
+def make_linkedin_titles(n: int, seed: int = 0) -> List[str]:
+    """n result titles in the 'Name - Headline | LinkedIn' form Serper returns."""
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(n):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        if rng.random() < 0.1:
+            titles.append(name)  # Some results have no headline
+        else:
+            titles.append(f"{name} - {rng.choice(SENIORITY)}{rng.choice(ROLES)} at {rng.choice(COMPANIES)} | LinkedIn")
+    return titles
+
+
+def make_serper_organic(n: int, seed: int = 0) -> List[Dict[str, str]]:
+    """n organic results as in a Serper search response."""
+    rng = random.Random(seed)
+    return [
+        {
+            "title": title,
+            "link": f"https://www.linkedin.com/in/serper-{seed}-{i}",
+            "snippet": make_headline(rng),
+            "position": i + 1,
+        }
+        for i, title in enumerate(make_linkedin_titles(n, seed))
+    ]
@@ -2,17 +2,22 @@ from agent.job_input import preprocess_job_description
 from agent.search_linkedin import search_linkedin
 from agent.score_candidates import score_candidates
 from agent.generate_outreach import generate_outreach
+from agent.job_profile import JobProfile
 
 def process_job(job_url):
     job = preprocess_job_description(job_url)
     candidates = search_linkedin(job['title'])
-    scored = score_candidates(candidates, job['summary'])
-    messages = generate_outreach(scored[:5], job['summary'])
+    # Ranking ignores the job location, as it always has
+    profile = JobProfile.from_job({**job, 'location': ''})
+    scored = score_candidates(candidates, profile)
+    messages = generate_outreach(scored[:5], profile)
     return {
         'job': job,
         'top_candidates': messages
     }
 
-job_url = "https://app.synapserecruiternetwork.com/job-page/1750452159644x262203891027542000"
-result = process_job(job_url)
-print(result)
\ No newline at end of file
+
+if __name__ == "__main__":
+    job_url = "https://app.synapserecruiternetwork.com/job-page/1750452159644x262203891027542000"
+    result = process_job(job_url)
+    print(result)